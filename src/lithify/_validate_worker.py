@@ -0,0 +1,161 @@
+# src/lithify/_validate_worker.py
+"""
+Runtime checks for a generated package, used by lithify.validation.
+
+The checks normally run in-process. For isolated validation this file is run in a fresh interpreter:
+
+    python _validate_worker.py <package_parent> <package_name> <base_symbol> <mode>
+
+It is executed as a script rather than with -m so neither the lithify package nor its CLI
+dependencies are imported; only pydantic and the generated package are loaded.
+"""
+
+import sys
+
+import pydantic
+
+
+def _package_models(pkg, pkg_name):
+    for name, obj in vars(pkg).items():
+        if isinstance(obj, type) and issubclass(obj, pydantic.BaseModel):
+            if obj.__module__.startswith(pkg_name):
+                yield name, obj
+
+
+def _load_base(pkg_name, base_symbol):
+    return getattr(__import__(pkg_name + ".frozen_base", fromlist=[base_symbol]), base_symbol)
+
+
+def _check_mutable(pkg, pkg_name, base_symbol):
+    # Try to find and instantiate a model
+    for _name, obj in _package_models(pkg, pkg_name):
+        try:
+            # Try with empty dict - models may have defaults
+            obj()
+            return
+        except Exception:
+            pass
+
+        # Try to find required fields and provide dummy values
+        try:
+            fields = obj.model_fields
+            data = {}
+            for field_name, field_info in fields.items():
+                if field_info.is_required():
+                    # Provide dummy value based on type
+                    annotation = field_info.annotation
+                    if annotation is int:
+                        data[field_name] = 1
+                    elif annotation is str:
+                        data[field_name] = "test"
+                    elif annotation is float:
+                        data[field_name] = 1.0
+                    elif annotation is bool:
+                        data[field_name] = True
+                    else:
+                        data[field_name] = None
+            instance = obj(**data)
+
+            # Test mutation (should work for mutable models)
+            for field_name in fields:
+                try:
+                    setattr(instance, field_name, data.get(field_name))
+                except Exception as e:
+                    raise AssertionError(f"Mutable model should allow mutation: {e}") from e
+            return
+        except Exception:
+            continue
+
+    # No models to validate, that's okay
+
+
+def _check_frozen(pkg, pkg_name, base_symbol):
+    FrozenBase = _load_base(pkg_name, base_symbol)
+
+    # Check that models subclass FrozenBase
+    bad = [
+        name
+        for name, obj in _package_models(pkg, pkg_name)
+        if obj is not FrozenBase and not issubclass(obj, FrozenBase)
+    ]
+    if bad:
+        raise SystemExit(f"Models not subclassing {base_symbol}: " + ", ".join(sorted(bad)))
+
+    # Test shallow freeze semantics
+    class TestModel(FrozenBase):
+        x: int
+        y: list[int]
+
+    m = TestModel(x=1, y=[1, 2])
+
+    # Attribute reassignment should fail
+    try:
+        m.x = 2
+        raise AssertionError("Attribute reassignment should fail on frozen model")
+    except (AttributeError, pydantic.ValidationError):
+        pass
+
+    # But container mutation should still work (shallow freeze)
+    m.y.append(3)
+    assert len(m.y) == 3, "Container mutation should work in shallow frozen mode"
+
+
+def _check_deep_frozen(pkg, pkg_name, base_symbol):
+    FrozenModel = _load_base(pkg_name, base_symbol)
+
+    # Check that all models subclass FrozenModel
+    bad = [
+        name
+        for name, obj in _package_models(pkg, pkg_name)
+        if obj is not FrozenModel and not issubclass(obj, FrozenModel)
+    ]
+    if bad:
+        raise SystemExit("Models not subclassing FrozenModel: " + ", ".join(sorted(bad)))
+
+    # Deep-freeze probe
+    class Probe(FrozenModel):
+        x: int
+        y: list[int]
+        z: dict[str, int]
+
+    p = Probe(x=1, y=[1, 2], z={"a": 1})
+
+    # Check deep freezing
+    assert isinstance(p.y, tuple), f"list not frozen to tuple, got {type(p.y)}"
+    assert not isinstance(p.z, dict) or not hasattr(p.z, "__setitem__"), "dict should be frozen"
+
+    # Attribute mutation should fail
+    try:
+        p.x = 2
+        raise AssertionError("Mutation should fail on lithified model")
+    except (AttributeError, pydantic.ValidationError):
+        pass
+
+    # Container mutation should also fail (deep freeze)
+    try:
+        if hasattr(p.y, "append"):
+            p.y.append(3)
+            raise AssertionError("Tuple should not have append method")
+    except AttributeError:
+        pass
+
+
+CHECKS = {
+    "mutable": _check_mutable,
+    "frozen": _check_frozen,
+    "deep-frozen": _check_deep_frozen,
+}
+
+
+def main(argv):
+    package_parent, pkg_name, base_symbol, mode = argv
+    # Replace the script directory so lithify's own modules cannot shadow anything the package imports
+    sys.path[0] = package_parent
+
+    pkg = __import__(pkg_name, fromlist=["*"])
+    CHECKS[mode](pkg, pkg_name, base_symbol)
+    print(f"{mode} OK")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -9,6 +9,7 @@ from typing import Literal
 import typer
 
 from .frozendict import FROZENDICT_SOURCE
+from .utils import SKIP_FILES
 
 MUTABLE_BASE_TEMPLATE = '''"""
 Standard mutable Pydantic models.
@@ -159,7 +160,7 @@ def rebase_generated_models(package_dir: Path, base_symbol: str, import_module:
 
     for py in package_dir.rglob("*.py"):
         # Skip infrastructure files - rebasing them would create circular imports
-        if py.name in {"__init__.py", "mutable_base.py", "frozen_base.py", "frozendict.py"}:
+        if py.name in SKIP_FILES:
             continue
 
         original_text = py.read_text(encoding="utf-8")
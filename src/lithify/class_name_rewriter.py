@@ -8,13 +8,15 @@ from pathlib import Path
 
 import typer
 
+from .utils import SKIP_FILES
+
 
 def build_rename_map(package_dir: Path, overrides: dict[str, str], verbose: int = 0) -> dict[str, str]:
     """DCG may sanitize schema titles, so we scan for actual class names."""
     rename_map: dict[str, str] = {}
 
     for py_file in package_dir.rglob("*.py"):
-        if py_file.name in {"__init__.py", "mutable_base.py", "frozen_base.py", "frozendict.py"}:
+        if py_file.name in SKIP_FILES:
             continue
 
         try:
@@ -74,7 +76,7 @@ def rewrite_class_names(package_dir: Path, overrides: dict[str, str], verbose: i
     modified = 0
 
     for py_file in package_dir.rglob("*.py"):
-        if py_file.name in {"__init__.py", "mutable_base.py", "frozen_base.py", "frozendict.py"}:
+        if py_file.name in SKIP_FILES:
             continue
 
         original_text = py_file.read_text(encoding="utf-8")
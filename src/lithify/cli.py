@@ -68,6 +68,14 @@ def diagnose() -> None:
             print(f"{name:<30} {'[OK]':<10} {version}")
         except ImportError:
             print(f"{name:<30} {'[MISSING]':<10} {'not installed'}")
+
+    try:
+        import yaml
+
+        libyaml = "yes" if getattr(yaml, "__with_libyaml__", False) else "no (pure-Python YAML parsing is slower)"
+        print(f"\nPyYAML libyaml: {libyaml}")
+    except ImportError:
+        pass
     print(f"\nPython: {sys.version}")
 
 
@@ -198,6 +206,9 @@ def generate(
         False, "--no-rewrite", help="Skip post-generation rewrite steps (useful for debugging)"
     ),
     dry_run: bool = typer.Option(False, "--dry-run", help="Show plan without writing anything"),
+    isolated_validation: bool = typer.Option(
+        False, "--isolated-validation", help="Validate generated models in a fresh interpreter instead of in-process"
+    ),
     clean_first: bool = typer.Option(False, "--clean", help="Remove existing outputs before generation"),
     check: bool = typer.Option(False, "--check", help="Check if models need regeneration (exit 1 if changes needed)"),
     verbose: int = typer.Option(0, "--verbose", "-v", count=True, callback=_verbosity_callback),
@@ -226,6 +237,7 @@ def generate(
         fmt=fmt,
         no_rewrite=no_rewrite,
         dry_run=dry_run,
+        isolated_validation=isolated_validation,
     )
 
     reporter = SimpleReporter()
@@ -19,6 +19,8 @@ from typing import Any
 
 import typer
 
+from .utils import dump_json_file, load_json_bytes, load_json_file, map_parallel
+
 Json = dict[str, Any] | list[Any] | str | int | float | bool | None
 
 
@@ -77,22 +79,26 @@ def _maybe_rewrite_const(node: dict[str, Any]) -> None:
                 node["type"] = inferred_type
 
 
+def _fix_const_node(node: dict[str, Any]) -> None:
+    _maybe_rewrite_const(node)
+
+    # Single-value float enums have same Literal[float] issue as const
+    if (
+        "enum" in node
+        and isinstance(node["enum"], list)
+        and len(node["enum"]) == 1
+        and isinstance(node["enum"][0], float)
+        and not isinstance(node["enum"][0], bool)
+    ):
+        f = node.pop("enum")[0]
+        node["type"] = "number"
+        node["minimum"] = f
+        node["maximum"] = f
+
+
 def _walk(node: Json) -> None:
     if isinstance(node, dict):
-        _maybe_rewrite_const(node)
-
-        # Single-value float enums have same Literal[float] issue as const
-        if (
-            "enum" in node
-            and isinstance(node["enum"], list)
-            and len(node["enum"]) == 1
-            and isinstance(node["enum"][0], float)
-            and not isinstance(node["enum"][0], bool)
-        ):
-            f = node.pop("enum")[0]
-            node["type"] = "number"
-            node["minimum"] = f
-            node["maximum"] = f
+        _fix_const_node(node)
 
         for key in _NUMERIC_COMPOSITES + _META_FIELDS:
             if key in node:
@@ -129,6 +135,9 @@ def rewrite_const_to_enum(root_schema: dict[str, Any]) -> dict[str, Any]:
     This works around two issues:
     1. DCG crashes on float const values
     2. Python's Literal type doesn't support float values
+
+    Mutates root_schema in place and returns it; callers pass a tree they own (deep-copy shared fixtures
+    first). No copy is made here, so the pass allocates only for the nodes it rewrites.
     """
     _walk(root_schema)
     return root_schema
@@ -137,33 +146,41 @@ def rewrite_const_to_enum(root_schema: dict[str, Any]) -> dict[str, Any]:
 rewrite_float_const_to_enum = rewrite_const_to_enum
 
 
-def load_yaml_safe(path: Path) -> Any:
+def _load_yaml_bytes(raw: bytes) -> Any:
     import yaml
 
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Bytes let the loader detect and decode the encoding itself instead of a separate Python-level decode
+    return yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def load_yaml_safe(path: Path) -> Any:
+    """Safe-load a YAML file, using libyaml's CSafeLoader when PyYAML was built with it."""
+    return _load_yaml_bytes(path.read_bytes())
 
 
 def dump_json(path: Path, data: Any) -> None:
     """Write JSON with deterministic output (sorted keys)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+    dump_json_file(path, data)
+
 
+def _yaml_sources(yaml_root: Path) -> list[Path]:
+    return [p for p in (*yaml_root.rglob("*.yaml"), *yaml_root.rglob("*.yml")) if p.is_file()]
 
-def build_schema_map(yaml_root: Path) -> dict[str, str]:
+
+def build_schema_map(yaml_root: Path, sources: list[Path] | None = None) -> dict[str, str]:
     """
     Map schema file names used in refs to the mirrored JSON target names.
     Handles numbered prefixes and .schema.json → .json.
 
+    Pass `sources` (every YAML file under yaml_root) when the caller has already walked the tree.
+
     Example:
       04_identity.yaml → "identity.schema.json" -> "04_identity.json"
                           "identity.json"       -> "04_identity.json"
     """
     schema_map: dict[str, str] = {}
-    for src in list(yaml_root.rglob("*.yaml")) + list(yaml_root.rglob("*.yml")):
-        if not src.is_file():
-            continue
+    for src in _yaml_sources(yaml_root) if sources is None else sources:
         name = src.stem
         target = f"{name}.json"
         unprefixed = name.split("_", 1)[1] if "_" in name and name.split("_", 1)[0].isdigit() else name
@@ -174,58 +191,113 @@ def build_schema_map(yaml_root: Path) -> dict[str, str]:
     return schema_map
 
 
-def _rewrite_single_ref(ref: str, base_url: str | None, schema_map: dict[str, str]) -> str:
-    original = ref
-
-    def _normalize(fname: str) -> str:
-        return fname[2:] if fname.startswith("./") else fname
+def _local_ref(mapped: str, frag: str) -> str:
+    new = mapped + frag
+    return new if new.startswith(".") else "./" + new
 
-    def split_frag(s: str) -> tuple[str, str]:
-        if "#" in s:
-            base, frag = s.split("#", 1)
-            return base, "#" + frag
-        return s, ""
 
+def _rewrite_single_ref(ref: str, base_url: str | None, schema_map: dict[str, str]) -> str:
+    # Module-level helpers and str.partition: this runs for every distinct $ref in a mirrored tree
     if base_url and ref.startswith(base_url):
-        remainder = ref[len(base_url) :]
-        base, frag = split_frag(remainder)
-        key = _normalize(base)
-        mapped = schema_map.get(key)
-        if not mapped:
-            mapped = base.replace(".schema.json", ".json")
-        new = mapped + frag
-        if not new.startswith("."):
-            new = "./" + new
-        return new
+        base, sep, frag = ref[len(base_url) :].partition("#")
+        key = base[2:] if base.startswith("./") else base
+        return _local_ref(schema_map.get(key) or base.replace(".schema.json", ".json"), sep + frag)
 
     if ref.startswith("./") or ref.endswith(".json") or ".schema.json" in ref:
-        base, frag = split_frag(ref)
-        key = _normalize(base)
-
-        mapped = schema_map.get(key)
-        if not mapped:
-            mapped = key.replace(".schema.json", ".json")
-        new = mapped + frag
-        if not new.startswith("."):
-            new = "./" + new
-        return new
+        base, sep, frag = ref.partition("#")
+        key = base[2:] if base.startswith("./") else base
+        return _local_ref(schema_map.get(key) or key.replace(".schema.json", ".json"), sep + frag)
 
-    return original
+    return ref
 
 
-def rewrite_remote_refs(data: Any, schema_map: dict[str, str], base_url: str | None) -> Any:
-    """Convert remote refs (and .schema.json) to local file refs using the schema map."""
-    if isinstance(data, dict):
-        new = {}
-        for k, v in data.items():
+def rewrite_remote_refs(
+    data: Any, schema_map: dict[str, str], base_url: str | None, ref_cache: dict[str, str] | None = None
+) -> Any:
+    """
+    Convert remote refs (and .schema.json) to local file refs using the schema map.
+
+    ref_cache memoizes rewritten refs; callers may share one across documents mirrored with the same
+    schema_map and base_url, since the same $ref strings recur throughout a schema tree.
+    """
+    return _transform_schema(data, schema_map, base_url, {} if ref_cache is None else ref_cache, fix_const=False)
+
+
+# Walk modes for _transform_schema, matching the keywords _walk descends into
+_PLAIN, _SCHEMA, _SCHEMA_MAP = 0, 1, 2
+_SCHEMA_KEYS = frozenset(_NUMERIC_COMPOSITES + _META_FIELDS + _ARRAY_FIELDS)
+_SCHEMA_MAP_KEYS = frozenset(_OBJECT_FIELDS + ("definitions", "$defs", "components", "schemas"))
+
+
+def _transform_schema(
+    data: Any,
+    schema_map: dict[str, str],
+    base_url: str | None,
+    ref_cache: dict[str, str],
+    *,
+    fix_const: bool,
+    in_place: bool = False,
+) -> Any:
+    """
+    Copy data with remote refs rewritten and, if fix_const, the const fixes of rewrite_const_to_enum applied.
+
+    One iterative pass replaces rewrite_remote_refs followed by rewrite_const_to_enum. Every $ref is
+    rewritten, as before, but const fixes only apply to nodes in schema position (those _walk visits).
+    A schema node is fixed after its children are copied, so its enum list is complete by then.
+
+    in_place rewrites data itself instead of copying it. Only use it on trees with no shared nodes
+    (freshly parsed JSON); YAML aliases share nodes, and a copy keeps each occurrence independent.
+    """
+    stack: list[tuple[Any, Any, int]] = []
+
+    def enter(value: Any, mode: int) -> Any:
+        if in_place:
+            if isinstance(value, dict | list):
+                stack.append((value, value, mode))
+            return value
+        if isinstance(value, dict):
+            new: Any = {}
+        elif isinstance(value, list):
+            new = []
+        else:
+            return value
+        stack.append((value, new, mode))
+        return new
+
+    root = enter(data, _SCHEMA if fix_const else _PLAIN)
+    while stack:
+        src, dst, mode = stack.pop()
+        if src is None:
+            _fix_const_node(dst)
+            continue
+        if isinstance(dst, list):
+            child = _SCHEMA if mode == _SCHEMA else _PLAIN
+            if in_place:
+                for v in src:
+                    enter(v, child)
+            else:
+                dst.extend([enter(v, child) for v in src])
+            continue
+        if mode == _SCHEMA:
+            stack.append((None, dst, _PLAIN))  # popped once all children are filled
+        for k, v in src.items():
             if k == "$ref" and isinstance(v, str):
-                new[k] = _rewrite_single_ref(v, base_url, schema_map)
+                rewritten = ref_cache.get(v)
+                if rewritten is None:
+                    rewritten = ref_cache[v] = _rewrite_single_ref(v, base_url, schema_map)
+                dst[k] = rewritten
+                continue
+            if mode == _SCHEMA:
+                if k in _SCHEMA_KEYS:
+                    child = _SCHEMA
+                elif k in _SCHEMA_MAP_KEYS and isinstance(v, dict):
+                    child = _SCHEMA_MAP
+                else:
+                    child = _PLAIN
             else:
-                new[k] = rewrite_remote_refs(v, schema_map, base_url)
-        return new
-    if isinstance(data, list):
-        return [rewrite_remote_refs(x, schema_map, base_url) for x in data]
-    return data
+                child = _SCHEMA if mode == _SCHEMA_MAP else _PLAIN
+            dst[k] = enter(v, child)
+    return root
 
 
 def _rewrite_custom_refs(
@@ -268,12 +340,11 @@ def _rewrite_custom_refs(
 
                                 # Copied files may contain custom refs - must process recursively
                                 if resolver:
-                                    copied_data = json.loads(target_path.read_text(encoding="utf-8"))
+                                    copied_data = load_json_file(target_path)
                                     copied_data = _rewrite_custom_refs(
                                         copied_data, json_root, target_path, resolver, resolutions, verbose
                                     )
-                                    with target_path.open("w", encoding="utf-8") as f:
-                                        json.dump(copied_data, f, indent=2, ensure_ascii=False, sort_keys=True)
+                                    dump_json_file(target_path, copied_data)
 
                                 if verbose >= 2:
                                     typer.echo(f"[custom-ref-copy] {resolved_abs} -> {target_path}")
@@ -321,6 +392,47 @@ def _should_exclude(path: Path, yaml_root: Path, exclude_patterns: list[str] | N
     return False
 
 
+# Per-worker state for parallel mirroring: the schema map ships once per process, not once per file,
+# and each worker keeps its own ref cache across the files it converts.
+_worker_schema_map: dict[str, str] = {}
+_worker_base_url: str | None = None
+_worker_ref_cache: dict[str, str] = {}
+
+
+def _may_need_const_fix(raw: bytes) -> bool:
+    """False only if the source cannot contain a const or enum key, so the const fixes can be skipped."""
+    # A backslash escape or a UTF-16 encoding could spell the key without these bytes
+    return b"const" in raw or b"enum" in raw or b"\\" in raw or raw[:2] in (b"\xff\xfe", b"\xfe\xff")
+
+
+def _mirror_one(src: Path, schema_map: dict[str, str], base_url: str | None, ref_cache: dict[str, str]) -> Any:
+    raw = src.read_bytes()
+    if src.suffix == ".json":
+        # A JSON parse never shares nodes, so the freshly parsed tree is rewritten without a copy
+        data = load_json_bytes(raw)
+        in_place = True
+    else:
+        data = _load_yaml_bytes(raw)
+        # Only a YAML alias (*name) can share a node; without a '*' anywhere the tree is unshared too
+        in_place = b"*" not in raw
+    # Fix datamodel-code-generator const issues in the same pass; custom refs never touch const/enum
+    return _transform_schema(
+        data, schema_map, base_url, ref_cache, fix_const=_may_need_const_fix(raw), in_place=in_place
+    )
+
+
+def _init_mirror_worker(schema_map: dict[str, str], base_url: str | None) -> None:
+    global _worker_schema_map, _worker_base_url, _worker_ref_cache
+    _worker_schema_map = schema_map
+    _worker_base_url = base_url
+    _worker_ref_cache = {}  # rewritten refs depend on the map, so a new map starts a new cache
+
+
+def _mirror_worker(task: tuple[Path, Path]) -> None:
+    src, dst = task
+    dump_json(dst, _mirror_one(src, _worker_schema_map, _worker_base_url, _worker_ref_cache))
+
+
 def mirror_yaml_to_json(
     yaml_root: Path,
     json_root: Path,
@@ -329,33 +441,27 @@ def mirror_yaml_to_json(
     custom_ref_resolver: Any | None = None,
     verbose: int = 0,
 ) -> list[Path]:
-    """Mirror YAML/JSON schemas to json_root, rewriting remote refs and applying custom resolver if provided."""
-    written: list[Path] = []
-    schema_map = build_schema_map(yaml_root)
-    custom_resolutions: dict[str, Path] = {}
+    """
+    Mirror YAML/JSON schemas to json_root, rewriting remote refs and applying custom resolver if provided.
 
-    for src in list(yaml_root.rglob("*.yaml")) + list(yaml_root.rglob("*.yml")):
-        if not src.is_file():
-            continue
+    Files convert independently, so large trees are spread over a process pool. A custom resolver
+    forces the serial path: it may not pickle and it records resolutions and copies files as it goes.
+    """
+    # One walk serves both the ref map (which covers excluded files too) and the task list
+    yaml_sources = _yaml_sources(yaml_root)
+    schema_map = build_schema_map(yaml_root, yaml_sources)
+    ref_cache: dict[str, str] = {}
+    custom_resolutions: dict[str, Path] = {}
+    tasks: list[tuple[Path, Path]] = []
 
+    for src in yaml_sources:
         if _should_exclude(src, yaml_root, exclude):
             if verbose >= 2:
                 typer.echo(f"[excluded] {src.relative_to(yaml_root)}")
             continue
 
         rel = src.relative_to(yaml_root)
-        dst = (json_root / rel).with_suffix(".json")
-        data = load_yaml_safe(src)
-        data = rewrite_remote_refs(data, schema_map, base_url)
-
-        if custom_ref_resolver:
-            data = _rewrite_custom_refs(data, json_root, dst, custom_ref_resolver, custom_resolutions, verbose)
-
-        data = rewrite_const_to_enum(data)  # Fix datamodel-code-generator const issues
-        dump_json(dst, data)
-        written.append(dst)
-        if verbose >= 2:
-            typer.echo(f"[yaml→json] {src} -> {dst}")
+        tasks.append((src, (json_root / rel).with_suffix(".json")))
 
     # Skip files already in json_root to avoid infinite recursion
     for src in yaml_root.rglob("*.json"):
@@ -374,19 +480,21 @@ def mirror_yaml_to_json(
             continue
 
         rel = src.relative_to(yaml_root)
-        dst = json_root / rel
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        data = json.loads(src.read_text(encoding="utf-8"))
-        data = rewrite_remote_refs(data, schema_map, base_url)
+        tasks.append((src, json_root / rel))
 
-        if custom_ref_resolver:
+    if custom_ref_resolver:
+        for src, dst in tasks:
+            data = _mirror_one(src, schema_map, base_url, ref_cache)
             data = _rewrite_custom_refs(data, json_root, dst, custom_ref_resolver, custom_resolutions, verbose)
 
-        data = rewrite_const_to_enum(data)  # Fix datamodel-code-generator const issues
-        dump_json(dst, data)
-        written.append(dst)
+            dump_json(dst, data)
+            if verbose >= 2:
+                typer.echo(f"[{'json' if src.suffix == '.json' else 'yaml'}→json] {src} -> {dst}")
+    else:
+        map_parallel(_mirror_worker, tasks, initializer=_init_mirror_worker, initargs=(schema_map, base_url))
         if verbose >= 2:
-            typer.echo(f"[json→json] {src} -> {dst}")
+            for src, dst in tasks:
+                typer.echo(f"[{'json' if src.suffix == '.json' else 'yaml'}→json] {src} -> {dst}")
 
     if custom_ref_resolver and custom_resolutions and verbose >= 1:
         typer.echo(f"[custom-refs] Resolved {len(custom_resolutions)} unique custom $refs")
@@ -394,18 +502,47 @@ def mirror_yaml_to_json(
             for ref, path in sorted(custom_resolutions.items()):
                 typer.echo(f"  {ref} → {path}")
 
-    return written
+    return [dst for _, dst in tasks]
 
 
 def _iter_refs(node: Any) -> Iterable[str]:
-    if isinstance(node, dict):
-        if "$ref" in node and isinstance(node["$ref"], str):
-            yield node["$ref"]
-        for v in node.values():
-            yield from _iter_refs(v)
-    elif isinstance(node, list):
-        for v in node:
-            yield from _iter_refs(v)
+    """Yield every string $ref in document order; iterative, so nesting depth is not bounded by recursion."""
+    stack = [node]
+    pop = stack.pop
+    push = stack.extend
+    while stack:
+        n = pop()
+        t = type(n)
+        if t is dict:
+            ref = n.get("$ref")
+            if type(ref) is str:
+                yield ref
+            children = n.values()
+        elif t is list:
+            children = n
+        else:
+            continue
+        # Reversed so the first child is popped first
+        push([v for v in children if type(v) is dict or type(v) is list][::-1])
+
+
+def _scan_refs(path: Path) -> tuple[list[str], str | None]:
+    """Parse one schema and return its non-local $refs, or the parse error message if it is not JSON."""
+    try:
+        schema = load_json_file(path)
+    except json.JSONDecodeError as e:
+        return [], str(e)
+    return [ref for ref in _iter_refs(schema) if not ref.startswith("#")], None
+
+
+def _check_ref_target(candidate: Path, json_root: Path) -> tuple[str, Path]:
+    if not candidate.exists():
+        return "missing", candidate
+    if not candidate.is_file():
+        return "bad", candidate
+    if json_root not in candidate.parents and candidate != json_root:
+        return "out-of-tree", candidate
+    return "ok", candidate
 
 
 def validate_schema_consistency(
@@ -416,23 +553,31 @@ def validate_schema_consistency(
 ) -> None:
     """
     Ensure that all file refs resolve under json_root. Remote refs warn or error.
+
+    Files are parsed independently, so large trees are scanned on a process pool; the ref checks that
+    join them run in this process.
     """
     problems: list[str] = []
     warnings: list[str] = []
 
     # Resolve json_root to handle symlinks (/var -> /private/var on macOS)
     json_root = json_root.resolve()
+    # Schemas in one directory tend to share targets; each (directory, file part) is resolved and stat'ed once
+    checked: dict[tuple[Path, str], tuple[str, Path]] = {}
 
-    for jf in sorted(json_root.rglob("*.json")):
-        try:
-            schema = json.loads(jf.read_text(encoding="utf-8"))
-        except json.JSONDecodeError as e:
-            problems.append(f"[invalid-json] {jf.relative_to(json_root)}: {e}")
+    # Scan every file up front: a ref to any file in this table is known to be an in-tree file, so only
+    # refs that leave the table need the filesystem
+    files = sorted(json_root.rglob("*.json"))
+    scanned: dict[Path, tuple[list[str], str | None]]
+
+    scanned = dict(zip(files, map_parallel(_scan_refs, files), strict=True))
+
+    for jf, (refs, error) in scanned.items():
+        if error is not None:
+            problems.append(f"[invalid-json] {jf.relative_to(json_root)}: {error}")
             continue
 
-        for ref in _iter_refs(schema):
-            if ref.startswith("#"):
-                continue
+        for ref in refs:
             if ref.startswith("http://") or ref.startswith("https://"):
                 msg = f"[remote-ref] {jf.relative_to(json_root)}: {ref}"
                 if block_remote_refs:
@@ -442,18 +587,22 @@ def validate_schema_consistency(
                 continue
 
             base = ref.split("#", 1)[0]
-            candidate = (jf.parent / base).resolve()
-            if not candidate.exists():
+            key = (jf.parent, base)
+            if key not in checked:
+                candidate = (jf.parent / base).resolve()
+                checked[key] = ("ok", candidate) if candidate in scanned else _check_ref_target(candidate, json_root)
+            status, candidate = checked[key]
+            if status == "missing":
                 rel_target = candidate
                 try:
                     rel_target = candidate.relative_to(json_root)
                 except Exception:
                     pass
                 problems.append(f"[missing-ref] {jf.relative_to(json_root)}: '{ref}' -> '{rel_target}' not found")
-            elif not candidate.is_file():
+            elif status == "bad":
                 problems.append(f"[bad-ref] {jf.relative_to(json_root)}: '{ref}' -> '{candidate}' is not a file")
 
-            elif json_root not in candidate.resolve().parents and candidate.resolve() != json_root:
+            elif status == "out-of-tree":
                 problems.append(
                     f"[out-of-tree-ref] {jf.relative_to(json_root)}: '{ref}' -> '{candidate}' outside '{json_root}'"
                 )
@@ -471,6 +620,12 @@ def validate_schema_consistency(
 def run_datamodel_codegen(
     json_root: Path, models_out_dir: Path, package_name: str, partial: bool = False, verbose: int = 0
 ) -> Path:
+    """
+    Generate models for the whole json_root tree with one datamodel-code-generator run.
+
+    The generator runs in a subprocess: importing its CLI module installs a SIGINT handler and
+    argv fast paths that must not leak into lithify's process.
+    """
     package_dir = models_out_dir / package_name
     package_dir.mkdir(parents=True, exist_ok=True)
 
@@ -19,7 +19,7 @@ from .slas_allof_processor import InlineAllOfInfo
 from .slas_field_mapper import build_field_map
 from .slas_rewriter import rewrite_all_modules
 from .slas_schema_index import SchemaIndex
-from .transforms import rewrite_type_hints_ast, wrap_all_docstrings
+from .transforms import apply_transforms
 from .validation import validate_deep_frozen_models, validate_frozen_models, validate_mutable_models
 from .workspace import copy_selected, staging_dir
 
@@ -48,6 +48,7 @@ class GenerationConfig:
     no_rewrite: bool = False
     dry_run: bool = False
     lenient_allof: bool = False
+    isolated_validation: bool = False
 
 
 @dataclass(slots=True)
@@ -282,20 +283,25 @@ def run_generation(cfg: GenerationConfig, r: Reporter) -> GenerationResult:
                 with r.task("Rewriting type hints to aliases..."):
                     rewrite_all_modules(st.package_dir, st.field_map, cfg.verbose)
 
-            if cfg.mutability == Mutability.deep_frozen and cfg.immutable_hints:
-                with r.task("Rewriting for immutability..."):
-                    rewrite_type_hints_ast(st.package_dir, verbose=cfg.verbose)
-
-        with r.task("Re-wrapping docstrings..."):
-            wrap_all_docstrings(st.package_dir, verbose=cfg.verbose)
+        # Immutable hints and docstring wrapping share one parse/unparse per file
+        rewrite_hints = not cfg.no_rewrite and cfg.mutability == Mutability.deep_frozen and cfg.immutable_hints
+        task_name = (
+            "Rewriting for immutability and re-wrapping docstrings..." if rewrite_hints else "Re-wrapping docstrings..."
+        )
+        with r.task(task_name):
+            apply_transforms(st.package_dir, hints=rewrite_hints, docstrings=True, verbose=cfg.verbose)
 
         with r.task("Validating models..."):
             if cfg.mutability == Mutability.mutable:
-                validate_mutable_models(st.package_dir, verbose=cfg.verbose)
+                validate_mutable_models(st.package_dir, verbose=cfg.verbose, isolate=cfg.isolated_validation)
             elif cfg.mutability == Mutability.frozen:
-                validate_frozen_models(st.package_dir, st.base_symbol, verbose=cfg.verbose)
+                validate_frozen_models(
+                    st.package_dir, st.base_symbol, verbose=cfg.verbose, isolate=cfg.isolated_validation
+                )
             else:
-                validate_deep_frozen_models(st.package_dir, st.base_symbol, verbose=cfg.verbose)
+                validate_deep_frozen_models(
+                    st.package_dir, st.base_symbol, verbose=cfg.verbose, isolate=cfg.isolated_validation
+                )
 
         _generate_init(st, cfg, r)
 
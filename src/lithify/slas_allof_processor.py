@@ -5,7 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from .slas_schema_index import SchemaIndex
-from .utils import walk_schema_nodes
+from .utils import walk_schema_nodes_with_parent
 
 
 @dataclass
@@ -108,10 +108,15 @@ def resolve_allof_branches(
     index: SchemaIndex,
     json_pointer: str,
     doc_uri: str,
+    ref_cache: dict[tuple[str, str], dict] | None = None,
 ) -> list[dict]:
     """
     Resolve all $refs in branches, detect circular references.
 
+    ref_cache maps (doc_uri, $ref) to the resolved node. Callers share one
+    cache across allOf nodes resolved against the same index and must drop
+    it when the index is reloaded.
+
     Raises ValueError if circular refs detected.
     """
     visited_nodes = set()
@@ -121,12 +126,19 @@ def resolve_allof_branches(
         if "$ref" in branch:
             ref_uri = branch["$ref"]
 
-            # Resolve the reference against the document's URI
-            full_ref_uri = index.resolve_ref(ref_uri, doc_uri)
+            cache_key = (doc_uri, ref_uri)
+            node = ref_cache.get(cache_key) if ref_cache is not None else None
+
+            if node is None:
+                # Resolve the reference against the document's URI
+                full_ref_uri = index.resolve_ref(ref_uri, doc_uri)
+
+                node = index.node_for(full_ref_uri)
+                if not node:
+                    raise ValueError(f"Cannot resolve $ref in allOf[{i}]: {ref_uri}")
 
-            node = index.node_for(full_ref_uri)
-            if not node:
-                raise ValueError(f"Cannot resolve $ref in allOf[{i}]: {ref_uri}")
+                if ref_cache is not None:
+                    ref_cache[cache_key] = node
 
             if id(node) in visited_nodes:
                 raise ValueError(f"Circular reference detected in allOf[{i}]: {ref_uri}")
@@ -193,6 +205,10 @@ def extract_uuid_version_set(pattern: str) -> set[str] | None:
     """
     clean = pattern.lstrip("^").rstrip("$")
 
+    # Four group separators are required; most non-UUID patterns fail here without the scan below
+    if clean.count("-") < 4:
+        return None
+
     hyphen_positions = []
     bracket_depth = 0
     brace_depth = 0
@@ -403,7 +419,8 @@ def process_allof_collapse(
 
     Args:
         json_dir: Directory with JSON schemas (modified in place)
-        index: Schema index for $ref resolution
+        index: Schema index for $ref resolution; updated in place with every rewritten file,
+            so on return it matches json_dir
         strict: Fail on unsatisfiable constraints
         verbose: Verbosity level
 
@@ -426,6 +443,9 @@ def process_allof_collapse(
 
         errors = []
         iteration_collapsed = 0
+        # Resolved nodes belong to the current index, so the cache lives for one iteration
+        ref_cache: dict[tuple[str, str], dict] = {}
+        dirty: list[Path] = []
 
         for schema_file in sorted(json_dir.glob("*.json")):
             schema = json.loads(schema_file.read_text(encoding="utf-8"))
@@ -448,12 +468,12 @@ def process_allof_collapse(
             else:
                 parent_class = None
 
-            for node, json_ptr in walk_schema_nodes(schema):
+            for node, json_ptr, parent, key in walk_schema_nodes_with_parent(schema):
                 if not is_allof_refinement(node):
                     continue
 
                 try:
-                    branches = resolve_allof_branches(node["allOf"], index, json_ptr, doc_uri)
+                    branches = resolve_allof_branches(node["allOf"], index, json_ptr, doc_uri, ref_cache)
                     scalar_type = validate_scalar_types(branches, json_ptr)
 
                     merged = merge_constraints(branches, scalar_type, json_ptr, strict)
@@ -477,8 +497,11 @@ def process_allof_collapse(
                         except ValueError:
                             pass
 
-                    node.clear()
-                    node.update(merged)
+                    if parent is None:
+                        node.clear()
+                        node.update(merged)
+                    else:
+                        parent[key] = merged
                     modified = True
                     iteration_collapsed += 1
 
@@ -494,6 +517,7 @@ def process_allof_collapse(
             if modified:
                 with schema_file.open("w", encoding="utf-8") as f:
                     json.dump(schema, f, indent=2, ensure_ascii=False, sort_keys=True)
+                dirty.append(schema_file)
 
         total_collapsed += iteration_collapsed
 
@@ -502,7 +526,8 @@ def process_allof_collapse(
                 print(f"[allof] Fixpoint reached after {iteration + 1} iteration(s)")
             break
 
-        index = SchemaIndex.load(list(json_dir.rglob("*.json")), index.base_url)
+        if dirty:
+            index.update(dirty)
 
     else:
         if iteration_collapsed > 0:
@@ -5,11 +5,11 @@ Field mapping for SLAS - tracks which model fields should use aliases.
 
 from __future__ import annotations
 
-import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from .slas_schema_index import SchemaIndex, resolve_uri
+from .utils import load_json_file
 
 
 @dataclass
@@ -18,6 +18,10 @@ class FieldTarget:
     field_name: str
     alias_fqn: str
     slot: str  # "self", "list_item", "dict_value", etc.
+    alias_name: str = field(init=False, repr=False, compare=False)  # last segment of alias_fqn
+
+    def __post_init__(self) -> None:
+        self.alias_name = self.alias_fqn.rsplit(".", 1)[-1]
 
     @property
     def field_key(self) -> str:
@@ -53,10 +57,13 @@ def build_field_map(
     from .slas_alias_generator import _determine_common_types_module
 
     field_map = {}
-    for doc_uri, doc in index.docs.items():
-        if not isinstance(doc, dict) or ("properties" not in doc and "patternProperties" not in doc):
-            continue
-
+    # Scalar-only docs (most of a typical index) can never contribute fields
+    model_docs = [
+        (doc_uri, doc)
+        for doc_uri, doc in index.docs.items()
+        if isinstance(doc, dict) and ("properties" in doc or "patternProperties" in doc)
+    ]
+    for doc_uri, doc in model_docs:
         model_name = doc.get("title")
         if not model_name:
             # Fallback to generate a model name from the URI
@@ -115,7 +122,13 @@ def build_field_map(
 
     common_types_module = _determine_common_types_module(index, package_name)
     for schema_file in sorted(json_dir.glob("*.json")):
-        schema = json.loads(schema_file.read_text(encoding="utf-8"))
+        # Top-level files are normally parsed in the index already; re-read only those it does not hold,
+        # such as a file whose $id another file also claims (the index keeps one document per URI)
+        doc_uri = index.doc_uri_for_path(schema_file)
+        if doc_uri is not None and index.origin_files[doc_uri].resolve() == schema_file.resolve():
+            schema = index.docs[doc_uri]
+        else:
+            schema = load_json_file(schema_file)
         if "title" not in schema:
             continue
 
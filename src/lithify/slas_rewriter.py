@@ -6,23 +6,66 @@ AST rewriter for SLAS - rewrites type hints to use aliases.
 from __future__ import annotations
 
 import ast
+import os
+import re
 from collections import defaultdict
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 from .slas_field_mapper import FieldTarget
+from .utils import map_parallel
 
 
-class FieldRewriter(ast.NodeTransformer):
-    def __init__(self, field_targets: dict[str, FieldTarget], depth: int, package_name: str):
+def bucket_targets_by_class(field_targets: dict[str, FieldTarget]) -> dict[str, dict[str, FieldTarget]]:
+    """Split "Model.field" keys into {model: {field: target}} for per-class lookups."""
+    by_class: dict[str, dict[str, FieldTarget]] = defaultdict(dict)
+    for key, target in field_targets.items():
+        class_name, _, field_name = key.partition(".")
+        by_class[class_name][field_name] = target
+    return dict(by_class)
+
+
+class FieldRewriter(ast.NodeVisitor):
+    """Rewrite field annotations in place; only class bodies are visited, never method bodies."""
+
+    def __init__(
+        self,
+        field_targets: dict[str, FieldTarget],
+        depth: int,
+        package_name: str,
+        targets_by_class: dict[str, dict[str, FieldTarget]] | None = None,
+    ):
         self.field_targets = field_targets
         self.depth = depth
         self.package_name = package_name
         self.imports_needed: dict[str, set[str]] = defaultdict(set)
+        self.modified = False  # set once any annotation is replaced
         self._stack: list[ast.AST] = []
         self._current_class: str | None = None
+        self._current_targets: dict[str, FieldTarget] | None = None
+
+        # Outer generic name -> handler, so a subscript annotation costs one dict lookup
+        self._subscript_handlers: dict[
+            str, Callable[[ast.Subscript, FieldTarget, Callable[[], ast.Name]], ast.expr | None]
+        ] = {
+            "Annotated": self._rewrite_annotated,
+            "Optional": self._rewrite_optional,
+            "List": self._rewrite_sequence,
+            "list": self._rewrite_sequence,
+            "Set": self._rewrite_sequence,
+            "set": self._rewrite_sequence,
+            "Dict": self._rewrite_dict,
+            "dict": self._rewrite_dict,
+            "Union": self._rewrite_union,
+        }
+
+        # Callers rewriting many modules pass the bucketed map in rather than rebuilding it per module
+        self._by_class = targets_by_class if targets_by_class is not None else bucket_targets_by_class(field_targets)
 
     def visit_Module(self, node: ast.Module) -> ast.Module:
-        self.generic_visit(node)
+        for stmt in node.body:
+            if isinstance(stmt, ast.ClassDef):
+                self.visit_ClassDef(stmt)
 
         new_imports = []
         for module, _names in sorted(self.imports_needed.items()):
@@ -63,26 +106,32 @@ class FieldRewriter(ast.NodeTransformer):
 
     def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
         old_class = self._current_class
+        old_targets = self._current_targets
         self._current_class = node.name
+        self._current_targets = self._by_class.get(node.name)
         self._stack.append(node)
 
         try:
-            self.generic_visit(node)
+            for item in node.body:
+                if isinstance(item, ast.ClassDef):
+                    self.visit_ClassDef(item)
+                elif self._current_targets and isinstance(item, ast.AnnAssign):
+                    self.visit_AnnAssign(item)
         finally:
             self._stack.pop()
             self._current_class = old_class
+            self._current_targets = old_targets
 
         return node
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> ast.AnnAssign:
-        if not self._current_class:
+        if not self._current_targets:
             return node
 
         if not isinstance(node.target, ast.Name):
             return node
 
-        field_key = f"{self._current_class}.{node.target.id}"
-        target = self.field_targets.get(field_key)
+        target = self._current_targets.get(node.target.id)
 
         if not target:
             return node
@@ -90,15 +139,15 @@ class FieldRewriter(ast.NodeTransformer):
         new_ann = self._rewrite_annotation(node.annotation, target)
         if new_ann is not None:
             node.annotation = new_ann
+            self.modified = True
 
-            parts = target.alias_fqn.rsplit(".", 1)
-            if len(parts) == 2:
-                self.imports_needed[target.alias_fqn].add(parts[1])
+            if "." in target.alias_fqn:
+                self.imports_needed[target.alias_fqn].add(target.alias_name)
 
         return node
 
     def _rewrite_annotation(self, ann: ast.expr, target: FieldTarget) -> ast.expr | None:
-        alias_name = target.alias_fqn.rsplit(".", 1)[-1]
+        alias_name = target.alias_name
 
         def make_alias():
             return ast.Name(id=alias_name, ctx=ast.Load())
@@ -113,50 +162,9 @@ class FieldRewriter(ast.NodeTransformer):
         # Subscript patterns (Optional, List, Annotated, etc.)
         elif isinstance(ann, ast.Subscript):
             if isinstance(ann.value, ast.Name):
-                # Handles DCG-generated fields with inline constraints from collapsed allOf
-                if ann.value.id == "Annotated" and target.slot == "self":
-                    return make_alias()
-
-                # Optional[...]
-                if ann.value.id == "Optional":
-                    inner = self._rewrite_annotation(
-                        ann.slice, FieldTarget(target.model_name, target.field_name, target.alias_fqn, "self")
-                    )
-                    if inner:
-                        return ast.Subscript(value=ann.value, slice=inner, ctx=ast.Load())
-
-                # List[str], Set[str]
-                elif ann.value.id in {"List", "list", "Set", "set"}:
-                    if target.slot in {"self", "list_item", "set_item"}:
-                        inner = make_alias()
-                        return ast.Subscript(value=ann.value, slice=inner, ctx=ast.Load())
-
-                # Dict[str, str] - replace value type only
-                elif ann.value.id in {"Dict", "dict"}:
-                    if isinstance(ann.slice, ast.Tuple) and len(ann.slice.elts) == 2:
-                        key_type, val_type = ann.slice.elts
-                        if target.slot in {"self", "dict_value"}:
-                            new_val = make_alias()
-                            return ast.Subscript(
-                                value=ann.value,
-                                slice=ast.Tuple(elts=[key_type, new_val], ctx=ast.Load()),
-                                ctx=ast.Load(),
-                            )
-
-                # Union[...]
-                elif ann.value.id == "Union":
-                    if isinstance(ann.slice, ast.Tuple):
-                        new_elts = []
-                        for elt in ann.slice.elts:
-                            if isinstance(elt, ast.Name) and elt.id == "str":
-                                new_elts.append(make_alias())
-                            else:
-                                new_elts.append(elt)
-
-                        if new_elts != ann.slice.elts:
-                            return ast.Subscript(
-                                value=ann.value, slice=ast.Tuple(elts=new_elts, ctx=ast.Load()), ctx=ast.Load()
-                            )
+                handler = self._subscript_handlers.get(ann.value.id)
+                if handler:
+                    return handler(ann, target, make_alias)
 
         # PEP 604 union: str | None
         elif isinstance(ann, ast.BinOp) and isinstance(ann.op, ast.BitOr):
@@ -168,12 +176,75 @@ class FieldRewriter(ast.NodeTransformer):
 
         return None
 
+    def _rewrite_annotated(
+        self, ann: ast.Subscript, target: FieldTarget, make_alias: Callable[[], ast.Name]
+    ) -> ast.expr | None:
+        # Handles DCG-generated fields with inline constraints from collapsed allOf
+        if target.slot == "self":
+            return make_alias()
+        return None
+
+    def _rewrite_optional(
+        self, ann: ast.Subscript, target: FieldTarget, make_alias: Callable[[], ast.Name]
+    ) -> ast.expr | None:
+        inner = self._rewrite_annotation(
+            ann.slice, FieldTarget(target.model_name, target.field_name, target.alias_fqn, "self")
+        )
+        if inner:
+            return ast.Subscript(value=ann.value, slice=inner, ctx=ast.Load())
+        return None
+
+    def _rewrite_sequence(
+        self, ann: ast.Subscript, target: FieldTarget, make_alias: Callable[[], ast.Name]
+    ) -> ast.expr | None:
+        # List[str], Set[str]
+        if target.slot in {"self", "list_item", "set_item"}:
+            return ast.Subscript(value=ann.value, slice=make_alias(), ctx=ast.Load())
+        return None
+
+    def _rewrite_dict(
+        self, ann: ast.Subscript, target: FieldTarget, make_alias: Callable[[], ast.Name]
+    ) -> ast.expr | None:
+        # Dict[str, str] - replace value type only
+        if isinstance(ann.slice, ast.Tuple) and len(ann.slice.elts) == 2:
+            key_type, _val_type = ann.slice.elts
+            if target.slot in {"self", "dict_value"}:
+                return ast.Subscript(
+                    value=ann.value,
+                    slice=ast.Tuple(elts=[key_type, make_alias()], ctx=ast.Load()),
+                    ctx=ast.Load(),
+                )
+        return None
+
+    def _rewrite_union(
+        self, ann: ast.Subscript, target: FieldTarget, make_alias: Callable[[], ast.Name]
+    ) -> ast.expr | None:
+        if isinstance(ann.slice, ast.Tuple):
+            new_elts = []
+            for elt in ann.slice.elts:
+                if isinstance(elt, ast.Name) and elt.id == "str":
+                    new_elts.append(make_alias())
+                else:
+                    new_elts.append(elt)
+
+            if new_elts != ann.slice.elts:
+                return ast.Subscript(value=ann.value, slice=ast.Tuple(elts=new_elts, ctx=ast.Load()), ctx=ast.Load())
+        return None
+
 
 def rewrite_module_with_aliases(
-    module_path: Path, field_map: dict[str, FieldTarget], depth: int, package_name: str, verbose: int = 0
+    module_path: Path,
+    field_map: dict[str, FieldTarget],
+    depth: int,
+    package_name: str,
+    verbose: int = 0,
+    targets_by_class: dict[str, dict[str, FieldTarget]] | None = None,
 ) -> bool:
     """Rewrite a generated module to use aliases.
 
+    targets_by_class is bucket_targets_by_class(field_map), precomputed by callers that
+    rewrite many modules against the same field map.
+
     Returns True if any changes were made.
     """
     code = module_path.read_text(encoding="utf-8")
@@ -185,20 +256,16 @@ def rewrite_module_with_aliases(
             print(f"[rewriter] Failed to parse {module_path}: {e}")
         return False
 
-    module_classes = set()
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef):
-            module_classes.add(node.name)
-
-    relevant_targets = {key: target for key, target in field_map.items() if target.model_name in module_classes}
-
-    if not relevant_targets:
+    if not field_map:
         return False
 
-    rewriter = FieldRewriter(relevant_targets, depth, package_name)
+    rewriter = FieldRewriter(field_map, depth, package_name, targets_by_class)
     new_tree = rewriter.visit(tree)
 
-    # Return early if no aliases were substituted
+    # Nothing was substituted: the tree is untouched, skip unparse
+    if not rewriter.modified:
+        return False
+
     if not rewriter.imports_needed:
         return False
 
@@ -211,30 +278,84 @@ def rewrite_module_with_aliases(
     return True
 
 
+_SKIPPED_MODULES = frozenset({"mutable_base.py", "frozen_base.py", "bases.py"})
+
+
+def _iter_rewritable_modules(root: str, depth: int = 0) -> Iterator[tuple[str, int]]:
+    """Yield (path, depth) for generated modules that may need alias rewriting.
+
+    Uses os.scandir so rejected entries are filtered by name without building Path objects.
+    """
+    in_defs = os.path.basename(root) == "defs"
+    with os.scandir(root) as entries:
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_rewritable_modules(entry.path, depth + 1)
+            elif (
+                name.endswith(".py")
+                and not name.startswith("_")
+                and name not in _SKIPPED_MODULES
+                and "_slas_" not in name
+                and not in_defs
+            ):
+                yield entry.path, depth
+
+
+_worker_args: tuple[dict[str, FieldTarget], str, int, dict[str, dict[str, FieldTarget]]] | None = None
+
+
+def _init_rewrite_worker(
+    field_map: dict[str, FieldTarget],
+    package_name: str,
+    verbose: int,
+    targets_by_class: dict[str, dict[str, FieldTarget]],
+) -> None:
+    # Sent once per worker rather than pickled with every task
+    global _worker_args
+    _worker_args = (field_map, package_name, verbose, targets_by_class)
+
+
+def _rewrite_worker(task: tuple[Path, int]) -> bool:
+    assert _worker_args is not None
+    field_map, package_name, verbose, targets_by_class = _worker_args
+    py_file, depth = task
+    return rewrite_module_with_aliases(py_file, field_map, depth, package_name, verbose, targets_by_class)
+
+
 def rewrite_all_modules(package_dir: Path, field_map: dict[str, FieldTarget], verbose: int = 0) -> int:
     """Rewrite all modules in a package to use aliases.
 
+    Modules are independent, so large packages are rewritten across worker processes.
+
     Returns the number of modules modified.
     """
-    modified_count = 0
     package_name = package_dir.name
 
-    for py_file in sorted(package_dir.rglob("*.py")):
-        if py_file.name.startswith("_"):
-            continue
-        if py_file.name in {"mutable_base.py", "frozen_base.py", "bases.py"}:
-            continue
-        if py_file.parent.name == "defs":
-            continue
+    if not field_map:
+        return 0
+
+    # A module can only need rewriting if it mentions one of the target classes
+    model_names = sorted({target.model_name for target in field_map.values()})
+    mentions_model = re.compile(b"|".join(re.escape(name.encode("utf-8")) for name in model_names))
+
+    targets_by_class = bucket_targets_by_class(field_map)
 
-        if "_slas_" in py_file.name:
+    tasks: list[tuple[Path, int]] = []
+    for path, depth in sorted(_iter_rewritable_modules(str(package_dir))):
+        py_file = Path(path)
+        if not mentions_model.search(py_file.read_bytes()):
             continue
+        tasks.append((py_file, depth))
 
-        relative_path = py_file.relative_to(package_dir)
-        depth = len(relative_path.parts) - 1
+    results = map_parallel(
+        _rewrite_worker,
+        tasks,
+        initializer=_init_rewrite_worker,
+        initargs=(field_map, package_name, verbose, targets_by_class),
+    )
 
-        if rewrite_module_with_aliases(py_file, field_map, depth, package_name, verbose):
-            modified_count += 1
+    modified_count = sum(results)
 
     if verbose and modified_count:
         print(f"[rewriter] Modified {modified_count} modules to use aliases")
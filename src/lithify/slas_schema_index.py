@@ -4,6 +4,8 @@
 from __future__ import annotations
 
 import json
+import sys
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
@@ -11,6 +13,8 @@ from urllib.parse import urldefrag, urljoin
 
 import typer
 
+from .utils import escape_pointer_token
+
 
 def resolve_pointer(doc: dict | list, pointer: str) -> Any:
     """RFC 6901 JSON Pointer resolution. Handles ~0/~1 escaping and array/object traversal."""
@@ -46,6 +50,55 @@ def resolve_uri(base: str, ref: str) -> tuple[str, str]:
     return nofrag, ("#" + frag) if frag else ""
 
 
+_SUBSCHEMA_KEYS = ("items", "prefixItems", "contains", "additionalProperties", "if", "then", "else", "not")
+_COMBINATOR_KEYS = ("allOf", "anyOf", "oneOf")
+
+# Keyword values repeated across nearly every schema; interned alongside all object keys
+_INTERNED_VALUES = frozenset(
+    {
+        "string",
+        "integer",
+        "number",
+        "boolean",
+        "object",
+        "array",
+        "null",
+        "uuid",
+        "date",
+        "date-time",
+        "time",
+        "duration",
+        "email",
+        "uri",
+        "uri-reference",
+        "hostname",
+        "ipv4",
+        "ipv6",
+    }
+)
+
+
+def intern_schema_object(pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+    """json object_pairs_hook: build the object with every key and common type/format value interned.
+
+    json does not share strings across documents; interning lets keyword lookups over a
+    large schema set compare by identity and keeps a single copy of each keyword in memory.
+    Interning while parsing needs no second pass over the document.
+    """
+    obj = {}
+    for k, v in pairs:
+        if type(v) is str:
+            if v in _INTERNED_VALUES:
+                v = sys.intern(v)
+        elif type(v) is list:
+            # e.g. "type": ["string", "null"]; the list is fresh from the parser, so intern in place
+            for i, item in enumerate(v):
+                if type(item) is str and item in _INTERNED_VALUES:
+                    v[i] = sys.intern(item)
+        obj[sys.intern(k)] = v
+    return obj
+
+
 def extract_class_name_override(schema: dict) -> str | None:
     return schema.get("x-python-class-name")
 
@@ -73,6 +126,8 @@ class SchemaIndex:
     origin_files: dict[str, Path] = field(default_factory=dict)  # doc_uri -> source file
     class_name_overrides: dict[str, str] = field(default_factory=dict)  # title -> x-python-class-name
     base_url: str | None = None
+    _path_to_uri: dict[Path, str] = field(default_factory=dict, repr=False)  # resolved source file -> doc_uri
+    _pointer_cache: dict[tuple[int, str], Any] = field(default_factory=dict, repr=False)  # (id(doc), fragment) -> node
 
     @classmethod
     def load(cls, paths: list[Path], base_url: str | None = None) -> SchemaIndex:
@@ -82,27 +137,70 @@ class SchemaIndex:
         for path in sorted(paths):
             if path.suffix != ".json":
                 continue
+            index._load_document(path)
 
-            try:
-                with path.open("r", encoding="utf-8") as f:
-                    doc = json.load(f)
-            except json.JSONDecodeError:
+        return index
+
+    def update(self, paths: Iterable[Path]) -> None:
+        """Re-index only the given files after they changed on disk.
+
+        Drops every entry derived from each file's previous document (nested $id docs,
+        pointers, anchors, subschema bases), then re-parses and re-indexes it. Much
+        cheaper than load() when only a handful of documents changed.
+        """
+        for path in sorted(paths):
+            if path.suffix != ".json":
                 continue
 
-            if "$id" in doc:
-                doc_uri = doc["$id"]
-            elif base_url:
-                rel_path = path.name
-                doc_uri = urljoin(base_url, rel_path)
-            else:
-                # lithify:/// pseudo-scheme allows refs without base_url while maintaining URI resolution semantics
-                doc_uri = f"lithify:///{path.stem}.json"
+            doc_uri = self.doc_uri_for_path(path)
+            if doc_uri is not None:
+                self._drop_document(doc_uri)
+            self._load_document(path)
 
-            index.docs[doc_uri] = doc
-            index.origin_files[doc_uri] = path
-            index._index_tree(doc, doc_uri, doc_uri)
+        # Cached entries are keyed by node identity; ids of dropped nodes can be reused
+        self._pointer_cache.clear()
 
-        return index
+    def _load_document(self, path: Path) -> None:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                doc = json.load(f, object_pairs_hook=intern_schema_object)
+        except json.JSONDecodeError:
+            return
+
+        if "$id" in doc:
+            doc_uri = doc["$id"]
+        elif self.base_url:
+            rel_path = path.name
+            doc_uri = urljoin(self.base_url, rel_path)
+        else:
+            # lithify:/// pseudo-scheme allows refs without base_url while maintaining URI resolution semantics
+            doc_uri = f"lithify:///{path.stem}.json"
+
+        # URIs recur as keys across docs/pointers/anchors and in refs_from results; share one copy
+        doc_uri = sys.intern(doc_uri)
+        self.docs[doc_uri] = doc
+        self.origin_files[doc_uri] = path
+        self._path_to_uri[path.resolve()] = doc_uri
+        self._index_tree(doc, doc_uri, doc_uri, origin_file=path)
+
+    def _drop_document(self, doc_uri: str) -> None:
+        doc = self.docs.pop(doc_uri, None)
+        origin = self.origin_files.pop(doc_uri, None)
+        if origin is not None:
+            self._path_to_uri.pop(origin.resolve(), None)
+
+        prefix = doc_uri + "#"
+        stale_ids = {id(doc)}
+        for uri in [u for u in self.pointers if u.startswith(prefix)]:
+            stale_ids.add(id(self.pointers.pop(uri)))
+        for uri in [u for u in self.anchors if u.startswith(prefix)]:
+            del self.anchors[uri]
+
+        # Nested $id subschemas were registered as docs of their own
+        for uri in [u for u, d in self.docs.items() if id(d) in stale_ids]:
+            del self.docs[uri]
+        for node_id in stale_ids:
+            self.subschema_bases.pop(node_id, None)
 
     def resolve_ref(self, ref: str, context_doc_uri: str) -> str:
         # Custom handling for lithify:/// pseudo-scheme
@@ -120,62 +218,71 @@ class SchemaIndex:
 
         return urljoin(context_doc_uri, ref)
 
-    def _index_tree(self, node: Any, doc_uri: str, base_uri: str, pointer: str = "") -> None:
-        if not isinstance(node, dict):
-            return
+    def _index_tree(
+        self, node: Any, doc_uri: str, base_uri: str, pointer: str = "", origin_file: Path | None = None
+    ) -> None:
+        # Local import: validation imports this module (via slas_allof_processor)
+        from .validation import validate_class_name_override
+
+        # Explicit stack instead of recursion: no frame per node and no recursion limit on deep
+        # schemas. Children are pushed in reverse so nodes are visited in the same pre-order.
+        stack: list[tuple[Any, str, str]] = [(node, base_uri, pointer)]
+        while stack:
+            node, base_uri, pointer = stack.pop()
+            if not isinstance(node, dict):
+                continue
+
+            if "title" in node:
+                override = extract_class_name_override(node)
+                if override:
+                    if origin_file:
+                        try:
+                            validate_class_name_override(override, origin_file)
+                        except ValueError as e:
+                            typer.secho(str(e), fg=typer.colors.RED)
+                            raise typer.Exit(1) from e
+                    self.class_name_overrides[node["title"]] = override
+
+            # JSON Schema Draft 2020-12: nested $id establishes new base URI for all relative refs in subtree
+            if "$id" in node and pointer:
+                nested_uri = sys.intern(urljoin(base_uri, node["$id"]))
+                self.docs[nested_uri] = node
+                base_uri = nested_uri
+
+            self.subschema_bases[id(node)] = base_uri
+
+            if pointer:
+                pointer_uri = sys.intern(doc_uri + "#" + pointer)
+                self.pointers[pointer_uri] = node
+
+            if "$anchor" in node:
+                anchor_uri = sys.intern(doc_uri + "#" + node["$anchor"])
+                self.anchors[anchor_uri] = node
+
+            children: list[tuple[Any, str, str]] = []
+
+            if "$defs" in node:
+                for name, subschema in node["$defs"].items():
+                    children.append((subschema, base_uri, f"{pointer}/$defs/{name}"))
 
-        if "title" in node:
-            override = extract_class_name_override(node)
-            if override:
-                from .validation import validate_class_name_override
-
-                origin_file = self.origin_files.get(doc_uri)
-                if origin_file:
-                    try:
-                        validate_class_name_override(override, origin_file)
-                    except ValueError as e:
-                        typer.secho(str(e), fg=typer.colors.RED)
-                        raise typer.Exit(1) from e
-                self.class_name_overrides[node["title"]] = override
-
-        # JSON Schema Draft 2020-12: nested $id establishes new base URI for all relative refs in subtree
-        if "$id" in node and pointer:
-            nested_uri = urljoin(base_uri, node["$id"])
-            self.docs[nested_uri] = node
-            base_uri = nested_uri
-
-        self.subschema_bases[id(node)] = base_uri
-
-        if pointer:
-            pointer_uri = doc_uri + "#" + pointer
-            self.pointers[pointer_uri] = node
-
-        if "$anchor" in node:
-            anchor_uri = doc_uri + "#" + node["$anchor"]
-            self.anchors[anchor_uri] = node
-
-        if "$defs" in node:
-            for name, subschema in node["$defs"].items():
-                self._index_tree(subschema, doc_uri, base_uri, f"{pointer}/$defs/{name}")
-
-        if "definitions" in node:
-            for name, subschema in node["definitions"].items():
-                self._index_tree(subschema, doc_uri, base_uri, f"{pointer}/definitions/{name}")
-
-        if "properties" in node:
-            for name, subschema in node["properties"].items():
-                # RFC 6901: escape ~ and / in JSON Pointer tokens (~ becomes ~0, / becomes ~1)
-                escaped = name.replace("~", "~0").replace("/", "~1")
-                self._index_tree(subschema, doc_uri, base_uri, f"{pointer}/properties/{escaped}")
-
-        for key in ["items", "prefixItems", "contains", "additionalProperties", "if", "then", "else", "not"]:
-            if key in node:
-                self._index_tree(node[key], doc_uri, base_uri, f"{pointer}/{key}")
-
-        for key in ["allOf", "anyOf", "oneOf"]:
-            if key in node and isinstance(node[key], list):
-                for i, subschema in enumerate(node[key]):
-                    self._index_tree(subschema, doc_uri, base_uri, f"{pointer}/{key}/{i}")
+            if "definitions" in node:
+                for name, subschema in node["definitions"].items():
+                    children.append((subschema, base_uri, f"{pointer}/definitions/{name}"))
+
+            if "properties" in node:
+                for name, subschema in node["properties"].items():
+                    children.append((subschema, base_uri, f"{pointer}/properties/{escape_pointer_token(name)}"))
+
+            for key in _SUBSCHEMA_KEYS:
+                if key in node:
+                    children.append((node[key], base_uri, f"{pointer}/{key}"))
+
+            for key in _COMBINATOR_KEYS:
+                if key in node and isinstance(node[key], list):
+                    for i, subschema in enumerate(node[key]):
+                        children.append((subschema, base_uri, f"{pointer}/{key}/{i}"))
+
+            stack.extend(reversed(children))
 
     def node_for(self, uri: str) -> dict[Any, Any] | None:
         # Custom handling for lithify:/// pseudo-scheme
@@ -206,10 +313,17 @@ class SchemaIndex:
             if pointer_uri in self.pointers:
                 return self.pointers[pointer_uri]
 
+            # Pointers into unindexed keywords are walked once per document and then memoized
+            cache_key = (id(doc), fragment)
+            if cache_key in self._pointer_cache:
+                return self._pointer_cache[cache_key]
+
             try:
-                return resolve_pointer(doc, fragment)
+                resolved = resolve_pointer(doc, fragment)
             except (KeyError, IndexError, TypeError):
                 return None
+            self._pointer_cache[cache_key] = resolved
+            return resolved
 
         return None
 
@@ -227,7 +341,7 @@ class SchemaIndex:
                 if "$ref" in obj:
                     ref = obj["$ref"]
                     abs_uri, frag = resolve_uri(base, ref)
-                    full_uri = abs_uri + (frag or "")
+                    full_uri = sys.intern(abs_uri + (frag or ""))
                     refs.append(full_uri)
 
                 for v in obj.values():
@@ -258,13 +372,7 @@ class SchemaIndex:
             >>> index.doc_uri_for_path(path)
             'lithify:///entity_v1.json'
         """
-        path_resolved = path.resolve()
-
-        for doc_uri, origin_path in self.origin_files.items():
-            if origin_path.resolve() == path_resolved:
-                return doc_uri
-
-        return None
+        return self._path_to_uri.get(path.resolve())
 
     def exportables(self, doc_uri: str) -> list[tuple[NodeId, str, str]]:
         """Get exportable symbols from a document.
@@ -9,7 +9,7 @@ import json
 from pathlib import Path
 from typing import Any
 
-from .slas_classifier import classify_shape
+from .utils import dump_json_file
 
 
 def remove_scalar_defs(json_dir: Path, modules_created: dict[str, list[str]], verbose: int = 0) -> None:
@@ -18,14 +18,18 @@ def remove_scalar_defs(json_dir: Path, modules_created: dict[str, list[str]], ve
     This prevents DCG from generating duplicate (and broken) types.
     """
 
-    handled_types = set()
+    handled_types: set[str] = set()
     for types in modules_created.values():
         handled_types.update(types)
+    handled = frozenset(handled_types)
 
     if verbose:
         print(f"[SLAS] Removing {len(handled_types)} scalar $defs from schemas")
 
     files_to_remove = []
+    # Parsed once and held in memory so the ref cleanup below needs no re-read; each file is written at most once
+    schemas: dict[Path, dict] = {}
+    modified_files: set[Path] = set()
 
     for json_file in json_dir.rglob("*.json"):
         if json_file.parent.name == "defs":
@@ -36,54 +40,19 @@ def remove_scalar_defs(json_dir: Path, modules_created: dict[str, list[str]], ve
                 schema = json.load(f)
         except json.JSONDecodeError:
             continue
+        schemas[json_file] = schema
 
-        modified = False
-        had_only_scalar_defs = False
-
-        if "$defs" in schema:
-            original_count = len(schema["$defs"])
-            remaining_defs = {}
-
-            for name, defn in schema["$defs"].items():
-                if name in handled_types:
-                    modified = True
-                    if verbose >= 2:
-                        print(f"  Removing {name} from {json_file.name}")
-                else:
-                    shape = classify_shape(defn)
-                    if shape in {"object", "array", "mixed", "unknown"}:
-                        remaining_defs[name] = defn
-                    else:
-                        remaining_defs[name] = defn
-
-            if remaining_defs:
-                schema["$defs"] = remaining_defs
-            else:
-                del schema["$defs"]
-                had_only_scalar_defs = True
-
-            if verbose >= 2 and modified:
-                print(f"  {json_file.name}: Removed {original_count - len(remaining_defs)} of {original_count} $defs")
-
-        if "definitions" in schema:
-            original_count = len(schema["definitions"])
-            remaining_defs = {}
-
-            for name, defn in schema["definitions"].items():
-                if name in handled_types:
-                    modified = True
-                else:
-                    shape = classify_shape(defn)
-                    if shape in {"object", "array", "mixed", "unknown"}:
-                        remaining_defs[name] = defn
-                    else:
-                        remaining_defs[name] = defn
-
-            if remaining_defs:
-                schema["definitions"] = remaining_defs
-            else:
-                del schema["definitions"]
-                had_only_scalar_defs = True
+        defs_count = len(schema.get("$defs", ()))
+        removed_defs, emptied_defs = _strip_handled_defs(schema, "$defs", handled)
+        removed_definitions, emptied_definitions = _strip_handled_defs(schema, "definitions", handled)
+
+        modified = bool(removed_defs or removed_definitions)
+        had_only_scalar_defs = emptied_defs or emptied_definitions
+
+        if verbose >= 2 and removed_defs:
+            for name in removed_defs:
+                print(f"  Removing {name} from {json_file.name}")
+            print(f"  {json_file.name}: Removed {len(removed_defs)} of {defs_count} $defs")
 
         if had_only_scalar_defs:
             has_content = False
@@ -101,35 +70,30 @@ def remove_scalar_defs(json_dir: Path, modules_created: dict[str, list[str]], ve
                     print(f"  Will remove empty schema file: {json_file.name}")
                 continue
 
-        if modified and json_file not in files_to_remove:
-            with json_file.open("w", encoding="utf-8") as f:
-                json.dump(schema, f, indent=2, sort_keys=True)
+        if modified:
+            modified_files.add(json_file)
 
-    # Second pass: remove references to files we're deleting
+    # Remove references to files we're deleting
     if files_to_remove:
         removed_names = {f.name for f in files_to_remove}
 
         if verbose:
             print(f"[SLAS] Removing references to {len(removed_names)} empty schemas")
 
-        for json_file in json_dir.rglob("*.json"):
-            if json_file in files_to_remove or json_file.parent.name == "defs":
-                continue
-
-            try:
-                with json_file.open("r", encoding="utf-8") as f:
-                    schema = json.load(f)
-            except json.JSONDecodeError:
+        for json_file, schema in schemas.items():
+            if json_file in files_to_remove:
                 continue
 
-            modified = _remove_refs_to_files(schema, removed_names)
-
-            if modified:
-                with json_file.open("w", encoding="utf-8") as f:
-                    json.dump(schema, f, indent=2, sort_keys=True)
+            if _remove_refs_to_files(schema, removed_names):
+                modified_files.add(json_file)
                 if verbose >= 2:
                     print(f"  Updated refs in {json_file.name}")
 
+    for json_file in modified_files:
+        if json_file in files_to_remove:
+            continue
+        dump_json_file(json_file, schemas[json_file])
+
     for json_file in files_to_remove:
         json_file.unlink()
         if verbose:
@@ -139,9 +103,43 @@ def remove_scalar_defs(json_dir: Path, modules_created: dict[str, list[str]], ve
         print("[SLAS] Schema preprocessing complete")
 
 
+def _strip_handled_defs(schema: dict, key: str, handled: frozenset[str]) -> tuple[list[str], bool]:
+    """Drop SLAS-handled names from the schema[key] definitions container.
+
+    Returns (removed names in document order, True if the container ended up empty and was deleted).
+    """
+    if key not in schema:
+        return [], False
+
+    container = schema[key]
+    # Set intersection in C; every def that is not handled by SLAS is kept as-is
+    to_remove = container.keys() & handled
+    removed = []
+    if to_remove:
+        removed = [name for name in container if name in to_remove]
+        container = {name: defn for name, defn in container.items() if name not in to_remove}
+
+    if container:
+        schema[key] = container
+        return removed, False
+
+    del schema[key]
+    return removed, True
+
+
 def _remove_refs_to_files(node: Any, removed_files: set[str]) -> bool:
-    if isinstance(node, dict):
-        modified = False
+    modified = False
+    stack = [node]
+
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, list):
+            stack.extend(item for item in node if isinstance(item, dict | list))
+            continue
+
+        if not isinstance(node, dict):
+            continue
 
         if "$ref" in node and isinstance(node["$ref"], str):
             ref = node["$ref"]
@@ -159,21 +157,10 @@ def _remove_refs_to_files(node: Any, removed_files: set[str]) -> bool:
                 node["type"] = "string"
                 modified = True
 
-        for key, value in list(node.items()):
-            if key != "$ref":
-                if _remove_refs_to_files(value, removed_files):
-                    modified = True
-
-        return modified
-
-    elif isinstance(node, list):
-        modified = False
-        for item in node:
-            if _remove_refs_to_files(item, removed_files):
-                modified = True
-        return modified
+        # Only $ref/type on this node are ever mutated, so its items can be iterated directly
+        stack.extend(value for key, value in node.items() if key != "$ref" and isinstance(value, dict | list))
 
-    return False
+    return modified
 
 
 def create_slas_placeholder_schema(module_name: str, types: list[str]) -> dict:
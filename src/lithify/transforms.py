@@ -6,11 +6,30 @@ AST-based type hint transformations for deep immutability.
 from __future__ import annotations
 
 import ast
+import re
 import textwrap
 from pathlib import Path
 
 import typer
 
+from .utils import SKIP_FILES, iter_files, map_parallel
+
+# A source edit: replace the text between two (lineno, col_offset) positions, as ast reports them
+_Edit = tuple[tuple[int, int], tuple[int, int], str]
+
+
+def _splice(src: str, edits: list[_Edit]) -> str:
+    """Apply edits to src. Columns are UTF-8 byte offsets, so the splice works on the encoded text."""
+    data = bytearray(src.encode("utf-8"))
+    line_starts = [0, 0]  # 1-based line numbers
+    for line in bytes(data).splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    spans = [(line_starts[sl] + sc, line_starts[el] + ec, text) for (sl, sc), (el, ec), text in edits]
+    for start, end, text in sorted(spans, reverse=True):
+        data[start:end] = text.encode("utf-8")
+    return data.decode("utf-8")
+
 
 class TypeHintTransformer(ast.NodeTransformer):
     """
@@ -23,110 +42,97 @@ class TypeHintTransformer(ast.NodeTransformer):
     Handles Optional/Union by transforming inner args.
     """
 
+    def __init__(self) -> None:
+        self.modified = False  # whether any hint was rewritten
+        self.emitted_mapping = False  # whether any Mapping[...] was produced
+        # The same rewrites as edits to the parsed source, or None once one has no exact textual equivalent
+        self.edits: list[_Edit] | None = []
+
+    def _rename(self, node: ast.Subscript, name: str) -> None:
+        self.modified = True
+        if self.edits is not None:
+            val = node.value
+            self.edits.append(((val.lineno, val.col_offset), (val.end_lineno, val.end_col_offset), name))
+        node.value = ast.Name(id=name, ctx=ast.Load())
+
+    def _make_variadic(self, node: ast.Subscript) -> None:
+        # Add Ellipsis to make it variable-length: tuple[T, ...]
+        if isinstance(node.slice, ast.Tuple):
+            node.slice.elts.append(ast.Constant(value=...))
+            self.edits = None  # parentheses or a trailing comma make the textual insertion ambiguous
+        else:
+            if self.edits is not None:
+                close = (node.end_lineno, node.end_col_offset - 1)  # the closing bracket
+                self.edits.append((close, close, ", ..."))
+            node.slice = ast.Tuple(elts=[node.slice, ast.Constant(value=...)], ctx=ast.Load())
+
     def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
         self.generic_visit(node)  # transform inner args first
         val = node.value
 
-        def _to_name(name: str) -> ast.Name:
-            return ast.Name(id=name, ctx=ast.Load())
-
         if isinstance(val, ast.Attribute) and isinstance(val.value, ast.Name):
-            base_mod = val.value.id
             sym = val.attr
-            if base_mod in {"typing", "collections", "collections.abc"}:
-                if sym in {"List", "list"}:
-                    node.value = _to_name("tuple")
-                    # Add Ellipsis to make it variable-length: tuple[T, ...]
-                    if isinstance(node.slice, ast.Tuple):
-                        node.slice.elts.append(ast.Constant(value=...))
-                    else:
-                        node.slice = ast.Tuple(elts=[node.slice, ast.Constant(value=...)], ctx=ast.Load())
-                elif sym in {"Set", "set"}:
-                    node.value = _to_name("frozenset")
-                elif sym in {"Dict", "dict", "MutableMapping"}:
-                    node.value = _to_name("Mapping")
+            if val.value.id not in {"typing", "collections", "collections.abc"}:
                 return node
-
-        if isinstance(val, ast.Name):
+        elif isinstance(val, ast.Name):
             sym = val.id
-            if sym in {"List", "list"}:
-                node.value = _to_name("tuple")
-                # Add Ellipsis to make it variable-length: tuple[T, ...]
-                if isinstance(node.slice, ast.Tuple):
-                    node.slice.elts.append(ast.Constant(value=...))
-                else:
-                    node.slice = ast.Tuple(elts=[node.slice, ast.Constant(value=...)], ctx=ast.Load())
-            elif sym in {"Set", "set"}:
-                node.value = _to_name("frozenset")
-            elif sym in {"Dict", "dict", "MutableMapping"}:
-                node.value = _to_name("Mapping")
+        else:
             return node
 
+        if sym in {"List", "list"}:
+            self._rename(node, "tuple")
+            self._make_variadic(node)
+        elif sym in {"Set", "set"}:
+            self._rename(node, "frozenset")
+        elif sym in {"Dict", "dict", "MutableMapping"}:
+            self._rename(node, "Mapping")
+            self.emitted_mapping = True
         return node
 
 
+# typing names the rewritten hints no longer use
+_DROP_TYPING = frozenset({"List", "Dict", "Set", "MutableMapping"})
+_TYPING_IMPORT_RE = re.compile(r"^from typing import([^\r\n]*)", re.MULTILINE)
+_FUTURE_IMPORT_RE = re.compile(r"^from __future__ import.*$", re.MULTILINE)
+
+
 def _ensure_mapping_import(src: str) -> str:
     need = "Mapping["
     if need not in src:
         return src
 
-    lines = src.splitlines()
-    found_line = -1
-    for i, line in enumerate(lines):
-        if line.startswith("from typing import"):
-            found_line = i
-            names = [n.strip() for n in line.split("import", 1)[1].split(",")]
-            names = [n for n in names if n not in {"List", "Dict", "Set", "MutableMapping"}]
-            if "Mapping" not in names:
-                names.append("Mapping")
-            names = sorted({n for n in names if n})
-            lines[i] = "from typing import " + ", ".join(names)
+    m = _TYPING_IMPORT_RE.search(src)
+    if m:
+        # A typing import holds a handful of names, so a list dedupe beats building a set
+        names = ["Mapping"]
+        for n in m.group(1).split(","):
+            n = n.strip()
+            if n and n not in names and n not in _DROP_TYPING:
+                names.append(n)
+        names.sort()
+        return src[: m.start()] + "from typing import " + ", ".join(names) + src[m.end() :]
+
+    # Insert after the last __future__ import within the first five lines, else at the top
+    insert_at = 0
+    for future in _FUTURE_IMPORT_RE.finditer(src):
+        if src.count("\n", 0, future.start()) >= 5:
             break
+        insert_at = future.end()
 
-    if found_line == -1:
-        insert_at = 0
-        for i, line in enumerate(lines[:5]):
-            if line.startswith("from __future__ import"):
-                insert_at = i + 1
-        lines.insert(insert_at, "from typing import Mapping")
-
-    return "\n".join(lines)
-
-
-def rewrite_type_hints_ast(package_dir: Path, verbose: int = 0) -> None:
-    """
-    Rewrite type hints in generated models to use immutable types.
-    Only applies to deep-frozen mode.
-    """
-    changed = 0
-
-    for py in package_dir.glob("*.py"):
-        if py.name in {"__init__.py", "frozen_base.py", "mutable_base.py", "frozendict.py"}:
-            continue
-
-        src = py.read_text(encoding="utf-8")
-        try:
-            tree = ast.parse(src)
-        except SyntaxError:
-            continue
-
-        new_tree = TypeHintTransformer().visit(tree)
-        ast.fix_missing_locations(new_tree)
-        new_src = ast.unparse(new_tree)
-        new_src = _ensure_mapping_import(new_src)
-
-        if new_src != src:
-            py.write_text(new_src, encoding="utf-8")
-            changed += 1
-
-    if verbose >= 1:
-        typer.echo(f"[hints] rewrote type hints in {changed} files for deep immutability")
+    if insert_at == 0:
+        return "from typing import Mapping\n" + src
+    return src[:insert_at] + "\nfrom typing import Mapping" + src[insert_at:]
 
 
 class DocstringWrapper(ast.NodeTransformer):
     def __init__(self, width: int = 79):
         # Set width for textwrap, leaving room for indentation and quotes
         self.width = width
+        self.modified = False  # whether any docstring was re-wrapped
+
+    def _replace_docstring(self, node: ast.ClassDef, docstring: ast.Expr) -> None:
+        node.body[0] = docstring
+        self.modified = True
 
     def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
         # First, visit children to handle nested classes
@@ -151,33 +157,152 @@ class DocstringWrapper(ast.NodeTransformer):
 
         # The docstring is always the first element in the body if it exists.
         if node.body and isinstance(node.body[0], ast.Expr) and isinstance(node.body[0].value, ast.Constant):
-            node.body[0] = new_docstring_node
+            self._replace_docstring(node, new_docstring_node)
 
         return node
 
 
-def wrap_all_docstrings(package_dir: Path, verbose: int = 0) -> None:
-    changed = 0
-    # Use rglob to catch all python files, even in subdirectories
-    for py_file in package_dir.rglob("*.py"):
-        if py_file.name.startswith(("_", "__")):
-            continue
+class ModelTransformer(TypeHintTransformer, DocstringWrapper):
+    """Apply TypeHintTransformer and/or DocstringWrapper in a single traversal."""
 
-        original_source = py_file.read_text(encoding="utf-8")
-        try:
-            tree = ast.parse(original_source)
-        except SyntaxError:
-            continue
+    def __init__(self, hints: bool = True, docstrings: bool = True, width: int = 79):
+        TypeHintTransformer.__init__(self)
+        DocstringWrapper.__init__(self, width)
+        self.hints = hints
+        self.docstrings = docstrings
+        # Which passes rewrote anything, so callers can report them separately
+        self.hints_modified = False
+        self.docs_modified = False
 
-        transformer = DocstringWrapper()
-        new_tree = transformer.visit(tree)
-        ast.fix_missing_locations(new_tree)
+    def _rename(self, node: ast.Subscript, name: str) -> None:
+        TypeHintTransformer._rename(self, node, name)
+        self.hints_modified = True
 
-        new_source = ast.unparse(new_tree)
+    def _replace_docstring(self, node: ast.ClassDef, docstring: ast.Expr) -> None:
+        DocstringWrapper._replace_docstring(self, node, docstring)
+        self.docs_modified = True
+        self.edits = None  # re-wrapped docstrings need the unparser
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        if not self.hints:
+            return self.generic_visit(node)
+        return TypeHintTransformer.visit_Subscript(self, node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.ClassDef:
+        if not self.docstrings:
+            self.generic_visit(node)
+            return node
+        return DocstringWrapper.visit_ClassDef(self, node)
 
-        if new_source != original_source:
-            py_file.write_text(new_source, encoding="utf-8")
-            changed += 1
+
+def _splices_typing_import(src: str) -> bool:
+    """Whether _ensure_mapping_import can safely rewrite src's typing import as a single line."""
+    m = _TYPING_IMPORT_RE.search(src)
+    return m is not None and not any(c in m.group(1) for c in "(\\#")
+
+
+def _transform_source(src: str, transformer: ModelTransformer) -> str:
+    """Run transformer over src and return the new text; its flags then say which passes rewrote anything."""
+    tree = ast.parse(src)
+    new_tree = transformer.visit(tree)
+    if not transformer.modified:
+        # Nothing rewritten: skip the unparse and keep the file byte-for-byte
+        return src
+
+    # Hint-only rewrites are token swaps, so splice them into the original text instead of unparsing
+    # the whole module. Import insertion is left to the unparse path, which has no header comments.
+    if transformer.edits:
+        new_src = _splice(src, transformer.edits)
+        if not transformer.emitted_mapping:
+            return new_src
+        if _splices_typing_import(new_src):
+            return _ensure_mapping_import(new_src)
+
+    ast.fix_missing_locations(new_tree)
+    new_src = ast.unparse(new_tree)
+    if transformer.emitted_mapping:
+        # The spliced import is not in the tree, so it no longer matches the text
+        return _ensure_mapping_import(new_src)
+    return new_src
+
+
+# Byte-level pre-filters: a module can only need a pass if these match, which is far cheaper than ast.parse.
+# Hints need a subscripted List/Set/Dict-like name; docstrings need a class (their quoting style varies).
+_HINT_MARKERS_RE = re.compile(rb"\b(?:List|list|Set|set|Dict|dict|MutableMapping)\s*\[")
+
+
+def _transform_file(task: tuple[Path, bool, bool]) -> tuple[bool, bool]:
+    """
+    Apply the requested passes to one module in place.
+
+    Returns (hints_changed, docs_changed): whether each pass rewrote the file.
+    """
+    py_file, do_hints, do_docs = task
+    data = py_file.read_bytes()
+    do_hints = do_hints and _HINT_MARKERS_RE.search(data) is not None
+    do_docs = do_docs and b"class" in data
+    if not (do_hints or do_docs):
+        return False, False
+
+    src = data.decode("utf-8")
+    transformer = ModelTransformer(hints=do_hints, docstrings=do_docs)
+    try:
+        new_src = _transform_source(src, transformer)
+    except SyntaxError:
+        return False, False
+
+    if new_src is src:
+        return False, False  # nothing rewritten
+    out = new_src.encode("utf-8")
+    if out == data:
+        return False, False
+    # The bytes are already encoded, so write them directly rather than through a text wrapper
+    py_file.write_bytes(out)
+    return transformer.hints_modified, transformer.docs_modified
+
+
+def apply_transforms(package_dir: Path, hints: bool, docstrings: bool, verbose: int = 0) -> int:
+    """
+    Rewrite immutable type hints and/or re-wrap class docstrings with one parse and unparse per file.
+
+    Hints apply to top-level modules only (deep-frozen mode); docstrings to every module in the tree
+    whose name does not start with an underscore. Files are independent, so large packages are
+    transformed across worker processes.
+
+    Returns the number of files changed.
+    """
+    if not (hints or docstrings):
+        return 0
+
+    # Docstrings reach python files in subdirectories too; hints only the top level
+    candidates = iter_files(package_dir, ".py", recursive=docstrings)
+    tasks: list[tuple[Path, bool, bool]] = []
+    for py_file in candidates:
+        do_hints = hints and py_file.parent == package_dir and py_file.name not in SKIP_FILES
+        do_docs = docstrings and not py_file.name.startswith("_")
+        if do_hints or do_docs:
+            tasks.append((py_file, do_hints, do_docs))
+
+    results = map_parallel(_transform_file, tasks)
 
     if verbose >= 1:
-        typer.echo(f"[docs] Re-wrapped docstrings in {changed} files.")
+        if hints:
+            hints_changed = sum(hints_done for hints_done, _ in results)
+            typer.echo(f"[hints] rewrote type hints in {hints_changed} files for deep immutability")
+        if docstrings:
+            docs_changed = sum(docs_done for _, docs_done in results)
+            typer.echo(f"[docs] Re-wrapped docstrings in {docs_changed} files.")
+
+    return sum(hints_done or docs_done for hints_done, docs_done in results)
+
+
+def rewrite_type_hints_ast(package_dir: Path, verbose: int = 0) -> None:
+    """
+    Rewrite type hints in generated models to use immutable types.
+    Only applies to deep-frozen mode.
+    """
+    apply_transforms(package_dir, hints=True, docstrings=False, verbose=verbose)
+
+
+def wrap_all_docstrings(package_dir: Path, verbose: int = 0) -> None:
+    apply_transforms(package_dir, hints=False, docstrings=True, verbose=verbose)
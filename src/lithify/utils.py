@@ -3,13 +3,38 @@
 from __future__ import annotations
 
 import json
+import math
+import os
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Any
 
 import typer
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    orjson = None
+
+
+# Infrastructure modules every generated package carries; passes over model modules skip them
+SKIP_FILES = frozenset({"__init__.py", "frozen_base.py", "mutable_base.py", "frozendict.py"})
+
+_PARALLEL_MIN_TASKS = 16  # below this, worker start-up outweighs the work saved
+
+_POINTER_ESCAPE = str.maketrans({"~": "~0", "/": "~1"})
+
+
+def escape_pointer_token(token: str) -> str:
+    """RFC 6901: escape ~ and / in a JSON Pointer token (~ becomes ~0, / becomes ~1)."""
+    # Most property names are plain identifiers; skip the translate call for them
+    if "~" not in token and "/" not in token:
+        return token
+    return token.translate(_POINTER_ESCAPE)
+
 
 def walk_schema_nodes(schema: Any, json_ptr: str = "#") -> Iterator[tuple[dict, str]]:
     """
@@ -30,81 +55,294 @@ def walk_schema_nodes(schema: Any, json_ptr: str = "#") -> Iterator[tuple[dict,
     Yields:
         (node_dict, json_pointer_string) tuples
     """
+    for node, ptr, _parent, _key in walk_schema_nodes_with_parent(schema, json_ptr):
+        yield (node, ptr)
+
+
+def walk_schema_nodes_with_parent(
+    schema: Any, json_ptr: str = "#", parent: dict | list | None = None, key: str | int | None = None
+) -> Iterator[tuple[dict, str, dict | list | None, str | int | None]]:
+    """
+    Walk schema nodes like walk_schema_nodes, also yielding the slot each node occupies.
+
+    Yields (node, json_pointer, parent, key) where parent[key] is node; parent and
+    key are None for the root. Callers may replace a node with parent[key] = new;
+    the walk then descends into the replacement instead of the original subtree.
+    """
     if not isinstance(schema, dict):
         return
 
-    # Yield current node
-    yield (schema, json_ptr)
-
-    # Properties
-    if "properties" in schema and isinstance(schema["properties"], dict):
-        for name, prop_schema in schema["properties"].items():
-            escaped = name.replace("~", "~0").replace("/", "~1")
-            yield from walk_schema_nodes(prop_schema, f"{json_ptr}/properties/{escaped}")
-
-    # Pattern properties
-    if "patternProperties" in schema and isinstance(schema["patternProperties"], dict):
-        for pattern, pattern_schema in schema["patternProperties"].items():
-            escaped = pattern.replace("~", "~0").replace("/", "~1")
-            yield from walk_schema_nodes(pattern_schema, f"{json_ptr}/patternProperties/{escaped}")
-
-    # Additional properties
-    if "additionalProperties" in schema and isinstance(schema["additionalProperties"], dict):
-        yield from walk_schema_nodes(schema["additionalProperties"], f"{json_ptr}/additionalProperties")
-
-    # Items
-    if "items" in schema:
-        if isinstance(schema["items"], dict):
-            yield from walk_schema_nodes(schema["items"], f"{json_ptr}/items")
-        elif isinstance(schema["items"], list):
-            for i, item_schema in enumerate(schema["items"]):
-                yield from walk_schema_nodes(item_schema, f"{json_ptr}/items/{i}")
-
-    # Prefix items
-    if "prefixItems" in schema and isinstance(schema["prefixItems"], list):
-        for i, item_schema in enumerate(schema["prefixItems"]):
-            yield from walk_schema_nodes(item_schema, f"{json_ptr}/prefixItems/{i}")
-
-    # Contains
-    if "contains" in schema and isinstance(schema["contains"], dict):
-        yield from walk_schema_nodes(schema["contains"], f"{json_ptr}/contains")
-
-    # Combiners
-    for keyword in ["allOf", "anyOf", "oneOf"]:
-        if keyword in schema and isinstance(schema[keyword], list):
-            for i, branch in enumerate(schema[keyword]):
-                yield from walk_schema_nodes(branch, f"{json_ptr}/{keyword}/{i}")
-
-    # Conditionals
-    for keyword in ["if", "then", "else", "not"]:
-        if keyword in schema and isinstance(schema[keyword], dict):
-            yield from walk_schema_nodes(schema[keyword], f"{json_ptr}/{keyword}")
-
-    # Dependent schemas
-    if "dependentSchemas" in schema and isinstance(schema["dependentSchemas"], dict):
-        for name, dep_schema in schema["dependentSchemas"].items():
-            escaped = name.replace("~", "~0").replace("/", "~1")
-            yield from walk_schema_nodes(dep_schema, f"{json_ptr}/dependentSchemas/{escaped}")
-
-    # Definitions
-    for def_key in ["$defs", "definitions"]:
-        if def_key in schema and isinstance(schema[def_key], dict):
-            for name, def_schema in schema[def_key].items():
-                yield from walk_schema_nodes(def_schema, f"{json_ptr}/{def_key}/{name}")
+    # Explicit stack instead of recursion: no generator frame per node and no depth limit.
+    # Children are pushed in reverse so nodes still come out in document pre-order.
+    stack: list[tuple[Any, str, dict | list | None, str | int | None]] = [(schema, json_ptr, parent, key)]
+    push = stack.append
+
+    while stack:
+        node, ptr, parent, key = stack.pop()
+        if not isinstance(node, dict):
+            continue
+
+        # Yield current node
+        yield (node, ptr, parent, key)
+
+        if parent is not None:
+            node = parent[key]
+            if not isinstance(node, dict):
+                continue
+
+        children: list[tuple[Any, str, dict | list | None, str | int | None]] = []
+        add = children.append
+
+        # Properties
+        if "properties" in node and isinstance(node["properties"], dict):
+            props = node["properties"]
+            for name, prop_schema in props.items():
+                escaped = escape_pointer_token(name)
+                add((prop_schema, f"{ptr}/properties/{escaped}", props, name))
+
+        # Pattern properties
+        if "patternProperties" in node and isinstance(node["patternProperties"], dict):
+            pattern_props = node["patternProperties"]
+            for pattern, pattern_schema in pattern_props.items():
+                escaped = escape_pointer_token(pattern)
+                add((pattern_schema, f"{ptr}/patternProperties/{escaped}", pattern_props, pattern))
+
+        # Additional properties
+        if "additionalProperties" in node and isinstance(node["additionalProperties"], dict):
+            add((node["additionalProperties"], f"{ptr}/additionalProperties", node, "additionalProperties"))
+
+        # Items
+        if "items" in node:
+            items = node["items"]
+            if isinstance(items, dict):
+                add((items, f"{ptr}/items", node, "items"))
+            elif isinstance(items, list):
+                for i, item_schema in enumerate(items):
+                    add((item_schema, f"{ptr}/items/{i}", items, i))
+
+        # Prefix items
+        if "prefixItems" in node and isinstance(node["prefixItems"], list):
+            prefix_items = node["prefixItems"]
+            for i, item_schema in enumerate(prefix_items):
+                add((item_schema, f"{ptr}/prefixItems/{i}", prefix_items, i))
+
+        # Contains
+        if "contains" in node and isinstance(node["contains"], dict):
+            add((node["contains"], f"{ptr}/contains", node, "contains"))
+
+        # Combiners
+        for keyword in ["allOf", "anyOf", "oneOf"]:
+            if keyword in node and isinstance(node[keyword], list):
+                branches = node[keyword]
+                for i, branch in enumerate(branches):
+                    add((branch, f"{ptr}/{keyword}/{i}", branches, i))
+
+        # Conditionals
+        for keyword in ["if", "then", "else", "not"]:
+            if keyword in node and isinstance(node[keyword], dict):
+                add((node[keyword], f"{ptr}/{keyword}", node, keyword))
+
+        # Dependent schemas
+        if "dependentSchemas" in node and isinstance(node["dependentSchemas"], dict):
+            dep_schemas = node["dependentSchemas"]
+            for name, dep_schema in dep_schemas.items():
+                escaped = escape_pointer_token(name)
+                add((dep_schema, f"{ptr}/dependentSchemas/{escaped}", dep_schemas, name))
+
+        # Definitions
+        for def_key in ["$defs", "definitions"]:
+            if def_key in node and isinstance(node[def_key], dict):
+                defs = node[def_key]
+                for name, def_schema in defs.items():
+                    add((def_schema, f"{ptr}/{def_key}/{name}", defs, name))
+
+        for child in reversed(children):
+            push(child)
+
+
+# Keyword table for iter_allof_nodes, in walk_schema_nodes order. Kinds: "named" maps names to
+# subschemas (pointer-escaped, or raw for definitions), "one" holds a subschema, "list" an array.
+_ALLOF_WALK = (
+    ("properties", "named"),
+    ("patternProperties", "named"),
+    ("additionalProperties", "one"),
+    ("items", "one_or_list"),
+    ("prefixItems", "list"),
+    ("contains", "one"),
+    ("allOf", "list"),
+    ("anyOf", "list"),
+    ("oneOf", "list"),
+    ("if", "one"),
+    ("then", "one"),
+    ("else", "one"),
+    ("not", "one"),
+    ("dependentSchemas", "named"),
+    ("$defs", "raw_named"),
+    ("definitions", "raw_named"),
+)
+
+
+def iter_allof_nodes(schema: Any, json_ptr: str = "#") -> Iterator[tuple[dict, str]]:
+    """
+    Yield (node, json_pointer) for every node walk_schema_nodes visits that has an allOf key.
+
+    Covers the same keywords as walk_schema_nodes, so validation sees exactly the nodes the allOf
+    collapse pass would, but skips the per-node yield and parent bookkeeping for everything else.
+    """
+    if not isinstance(schema, dict):
+        return
+
+    stack: list[tuple[dict, str]] = [(schema, json_ptr)]
+    push = stack.append
+
+    while stack:
+        node, ptr = stack.pop()
+        if "allOf" in node:
+            yield (node, ptr)
+
+        children: list[tuple[dict, str]] = []
+        add = children.append
+        for keyword, kind in _ALLOF_WALK:
+            if keyword not in node:
+                continue
+            value = node[keyword]
+            if isinstance(value, dict):
+                if kind == "named":
+                    for name, sub in value.items():
+                        if isinstance(sub, dict):
+                            add((sub, f"{ptr}/{keyword}/{escape_pointer_token(name)}"))
+                elif kind == "raw_named":
+                    for name, sub in value.items():
+                        if isinstance(sub, dict):
+                            add((sub, f"{ptr}/{keyword}/{name}"))
+                elif kind != "list":
+                    add((value, f"{ptr}/{keyword}"))
+            elif isinstance(value, list) and kind in ("list", "one_or_list"):
+                for i, sub in enumerate(value):
+                    if isinstance(sub, dict):
+                        add((sub, f"{ptr}/{keyword}/{i}"))
+
+        for child in reversed(children):
+            push(child)
+
+
+def iter_files(
+    root: Path, suffix: str, *, recursive: bool = False, skip: frozenset[str] = frozenset()
+) -> Iterator[Path]:
+    """
+    Yield files under root whose names end with suffix and are not in skip.
+
+    A glob/rglob replacement built on os.scandir: entries are filtered by name and cached
+    file type first, so rejected entries never become Path objects. Like rglob, symlinked
+    directories are not descended into.
+    """
+    dirs = [os.fspath(root)]
+    while dirs:
+        with os.scandir(dirs.pop()) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(suffix) and name not in skip and entry.is_file():
+                    yield Path(entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.path)
 
 
 def write_if_changed(path: Path, content: str) -> bool:
-    if path.exists():
-        existing = path.read_text(encoding="utf-8")
-        if existing == content:
+    # The exact bytes write_text would produce; a size mismatch settles most changes without reading the file
+    encoded = (content if os.linesep == "\n" else content.replace("\n", os.linesep)).encode("utf-8")
+    try:
+        if path.stat().st_size == len(encoded) and path.read_bytes() == encoded:
             return False
+    except FileNotFoundError:
+        pass
 
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(content, encoding="utf-8")
+    tmp.write_bytes(encoded)
     tmp.replace(path)
     return True
 
 
+def load_json_bytes(raw: bytes) -> Any:
+    """Parse UTF-8 JSON.
+
+    Always stdlib json, even when orjson is installed: orjson.loads silently turns integers wider
+    than 64 bits into floats, which would corrupt large minimum/maximum bounds.
+    """
+    return json.loads(raw.decode("utf-8"))
+
+
+def load_json_file(path: Path) -> Any:
+    """Parse a UTF-8 JSON file; see load_json_bytes."""
+    return load_json_bytes(path.read_bytes())
+
+
+def _has_non_finite(data: Any) -> bool:
+    """Whether data holds a NaN or infinite float anywhere; iterative, so depth is not bounded."""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+        elif isinstance(node, float) and not math.isfinite(node):
+            return True
+    return False
+
+
+def dump_json_file(path: Path, data: Any) -> None:
+    """Write data as 2-space indented, key-sorted JSON.
+
+    Uses orjson when available (the indent/sort path is the slowest part of stdlib json). Falls back
+    to json for integers wider than 64 bits, which orjson rejects, and for NaN and infinities, which
+    orjson would silently write as null where json writes NaN/Infinity.
+    """
+    if orjson is not None:
+        try:
+            out = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            out = None
+        # A non-finite float can only have become a null, so most documents skip the walk
+        if out is not None and not (b"null" in out and _has_non_finite(data)):
+            path.write_bytes(out)
+            return
+
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+
+
+def map_parallel(
+    fn: Callable[[Any], Any],
+    tasks: Sequence[Any],
+    *,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> list[Any]:
+    """
+    Return [fn(task) for task in tasks], spread across worker processes when there are enough tasks.
+
+    initializer(*initargs) runs once per worker, or once in this process for a serial run, so shared
+    state ships once per process rather than with every task. If workers cannot be started or one dies,
+    the whole batch runs serially here instead, so fn must be safe to repeat on a task.
+    """
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if len(tasks) >= _PARALLEL_MIN_TASKS and workers > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+        except OSError:
+            pass  # no process support (e.g. missing semaphores)
+        else:
+            try:
+                with executor:
+                    return list(executor.map(fn, tasks, chunksize=8))
+            except BrokenProcessPool:
+                pass  # a worker was killed (e.g. out of memory)
+
+    if initializer is not None:
+        initializer(*initargs)
+    return [fn(task) for task in tasks]
+
+
 def require_deps() -> None:
     try:
         import yaml  # noqa: F401
@@ -128,6 +366,10 @@ def require_deps() -> None:
         raise typer.Exit(1) from None
 
 
+# Matched on raw bytes so files are never decoded; non-ASCII bytes stand in for Unicode identifier characters
+_CLASS_RE = re.compile(rb"^class\s+((?:\w|[\x80-\xff])+)\([^)]+\):", re.MULTILINE)
+
+
 def write_manifest(
     package_dir: Path,
     *,
@@ -138,13 +380,12 @@ def write_manifest(
     verbose: int = 0,
 ) -> None:
     cls_index: dict[str, list[str]] = {}
-    class_re = re.compile(r"^class\s+(\w+)\([^)]+\):", re.MULTILINE)
 
-    for py in package_dir.glob("*.py"):
-        if py.name in {"__init__.py", "frozen_base.py", "mutable_base.py", "frozendict.py"}:
+    for py in iter_files(package_dir, ".py", skip=SKIP_FILES):
+        data = py.read_bytes()
+        if b"class" not in data:
             continue
-        text = py.read_text(encoding="utf-8")
-        classes = class_re.findall(text)
+        classes = [m.group(1).decode("utf-8") for m in _CLASS_RE.finditer(data)]
         if classes:
             cls_index[py.name] = classes
 
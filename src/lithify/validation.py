@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import importlib
 import json
 import keyword
 import subprocess
 import sys
+import traceback
 from pathlib import Path
 
 import typer
@@ -18,25 +20,34 @@ from .slas_allof_processor import (
     validate_scalar_types,
 )
 from .slas_schema_index import SchemaIndex
-from .utils import walk_schema_nodes
+from .utils import iter_allof_nodes, iter_files
 
 
 def validate_allof_constraints(json_dir: Path, index: SchemaIndex, strict: bool = True, verbose: int = 0) -> list[str]:
-    """Fast validation before expensive DCG runs."""
-    errors = []
-
-    for schema_file in json_dir.glob("*.json"):
-        schema = json.loads(schema_file.read_text())
+    """Fast validation before expensive DCG runs.
 
-        # Use schema walker to find all allOf nodes
-        for node, json_ptr in walk_schema_nodes(schema):
+    index must be loaded from the documents in json_dir and is only read, so every $ref is resolved
+    at most once per document for the whole run.
+    """
+    errors = []
+    ref_cache: dict[tuple[str, str], dict] = {}
+
+    for schema_file in iter_files(json_dir, ".json"):
+        # The index already holds every document it was loaded from; only parse files it lacks
+        indexed_uri = index.doc_uri_for_path(schema_file)
+        schema = index.docs.get(indexed_uri) if indexed_uri is not None else None
+        if schema is None:
+            schema = json.loads(schema_file.read_text())
+        doc_uri = schema_file.as_uri()
+
+        # Only nodes carrying allOf can be refinements
+        for node, json_ptr in iter_allof_nodes(schema):
             if not is_allof_refinement(node):
                 continue
 
             try:
                 # Validate without modifying
-                doc_uri = schema_file.as_uri()
-                branches = resolve_allof_branches(node["allOf"], index, json_ptr, doc_uri)
+                branches = resolve_allof_branches(node["allOf"], index, json_ptr, doc_uri, ref_cache)
                 scalar_type = validate_scalar_types(branches, json_ptr)
                 merged = merge_constraints(branches, scalar_type, json_ptr, strict)
                 validate_satisfiability(merged, json_ptr, strict)
@@ -64,193 +75,76 @@ def validate_class_name_override(name: str, schema_path: Path) -> None:
         raise ValueError(f"{schema_path}: x-python-class-name '{name}' is a Python keyword")
 
 
-def validate_mutable_models(package_dir: Path, verbose: int = 0) -> None:
-    pkg_name = package_dir.name
-    code = f"""
-import sys
-sys.path.insert(0, {str(package_dir.parent)!r})
-import pydantic
-
-# Import the package
-pkg = __import__({pkg_name!r}, fromlist=['*'])
-
-# Try to find and instantiate a model
-found_model = False
-for name, obj in vars(pkg).items():
-    if isinstance(obj, type) and issubclass(obj, pydantic.BaseModel):
-        if obj.__module__.startswith(pkg_name):
-            # Found a model, try to instantiate it
-            try:
-                # Try with empty dict - models may have defaults
-                instance = obj()
-                found_model = True
-                break
-            except:
-                # Try to find required fields and provide dummy values
-                try:
-                    fields = obj.model_fields
-                    data = {{}}
-                    for field_name, field_info in fields.items():
-                        if field_info.is_required():
-                            # Provide dummy value based on type
-                            annotation = field_info.annotation
-                            if annotation == int:
-                                data[field_name] = 1
-                            elif annotation == str:
-                                data[field_name] = "test"
-                            elif annotation == float:
-                                data[field_name] = 1.0
-                            elif annotation == bool:
-                                data[field_name] = True
-                            else:
-                                data[field_name] = None
-                    instance = obj(**data)
-                    found_model = True
-
-                    # Test mutation (should work for mutable models)
-                    for field_name in fields:
-                        try:
-                            setattr(instance, field_name, data.get(field_name))
-                        except Exception as e:
-                            raise AssertionError(f"Mutable model should allow mutation: {{e}}")
-                    break
-                except:
-                    continue
-
-if not found_model:
-    # No models to validate, that's okay
-    pass
-
-print("OK")
-"""
-
-    if verbose:
-        typer.echo("[validate] checking mutable models")
-
-    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
-    if r.returncode != 0:
-        typer.echo(r.stdout)
-        typer.secho(r.stderr, fg=typer.colors.RED)
-        raise typer.Exit(1)
-
-    if verbose:
-        typer.echo("[validate] mutable models OK")
-
-
-def validate_frozen_models(package_dir: Path, base_symbol: str, verbose: int = 0) -> None:
-    pkg_name = package_dir.name
-    code = f"""
-import sys
-sys.path.insert(0, {str(package_dir.parent)!r})
-import pydantic
+_VALIDATE_WORKER = Path(__file__).with_name("_validate_worker.py")
 
-pkg = __import__({pkg_name!r}, fromlist=['*'])
-FrozenBase = __import__({pkg_name!r}+'.frozen_base', fromlist=[{base_symbol!r}]).{base_symbol}
+_VALIDATE_OK = {
+    "mutable": "[validate] mutable models OK",
+    "frozen": "[validate] frozen models OK",
+    "deep-frozen": "[validate] deep-frozen models OK (lithified)",
+}
 
-# Check that models subclass FrozenBase
-bad = []
-for name, obj in vars(pkg).items():
-    if isinstance(obj, type) and issubclass(obj, pydantic.BaseModel):
-        if obj.__module__.startswith(pkg_name) and obj is not FrozenBase:
-            if not issubclass(obj, FrozenBase):
-                bad.append(name)
 
-if bad:
-    raise SystemExit(f"Models not subclassing {{base_symbol}}: " + ", ".join(sorted(bad)))
+def _run_validators(
+    mode: str, package_dir: Path, base_symbol: str = "", verbose: int = 0, *, isolate: bool = False
+) -> None:
+    """Run the runtime checks for one mode against a generated package.
 
-# Test shallow freeze semantics
-class TestModel(FrozenBase):
-    x: int
-    y: list[int]
+    By default the package is imported into this interpreter; isolate=True runs the checks in a fresh
+    interpreter instead, for packages whose import has side effects the caller must not inherit.
+    """
+    if verbose:
+        typer.echo(f"[validate] checking {mode} models")
+
+    if isolate:
+        cmd = [sys.executable, str(_VALIDATE_WORKER), str(package_dir.parent), package_dir.name, base_symbol, mode]
+        r = subprocess.run(cmd, capture_output=True, text=True)
+        if r.returncode != 0:
+            typer.echo(r.stdout)
+            typer.secho(r.stderr, fg=typer.colors.RED)
+            raise typer.Exit(1)
+    else:
+        _run_validators_in_process(mode, package_dir, base_symbol)
 
-m = TestModel(x=1, y=[1, 2])
+    if verbose:
+        typer.echo(_VALIDATE_OK[mode])
 
-# Attribute reassignment should fail
-try:
-    m.x = 2
-    raise AssertionError("Attribute reassignment should fail on frozen model")
-except (AttributeError, pydantic.ValidationError):
-    pass
 
-# But container mutation should still work (shallow freeze)
-m.y.append(3)  # This should work
-assert len(m.y) == 3, "Container mutation should work in shallow frozen mode"
+def _run_validators_in_process(mode: str, package_dir: Path, base_symbol: str) -> None:
+    from . import _validate_worker  # pulls in pydantic, so only on demand
 
-print("OK")
-"""
+    pkg_name = package_dir.name
+    search_path = str(package_dir.parent)
 
-    if verbose:
-        typer.echo("[validate] checking frozen models")
+    def owned_modules() -> list[str]:
+        return [name for name in sys.modules if name == pkg_name or name.startswith(pkg_name + ".")]
 
-    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
-    if r.returncode != 0:
-        typer.echo(r.stdout)
-        typer.secho(r.stderr, fg=typer.colors.RED)
-        raise typer.Exit(1)
+    # Set aside any module already imported under the package name (an earlier build, or an unrelated
+    # package), so the checks see the freshly generated files and the caller gets its modules back.
+    saved = {name: sys.modules.pop(name) for name in owned_modules()}
+    sys.path.insert(0, search_path)
+    importlib.invalidate_caches()
+    try:
+        pkg = importlib.import_module(pkg_name)
+        _validate_worker.CHECKS[mode](pkg, pkg_name, base_symbol)
+    except (Exception, SystemExit) as e:
+        typer.secho(traceback.format_exc(), fg=typer.colors.RED)
+        raise typer.Exit(1) from e
+    finally:
+        sys.path.remove(search_path)
+        for name in owned_modules():
+            del sys.modules[name]
+        sys.modules.update(saved)
 
-    if verbose:
-        typer.echo("[validate] frozen models OK")
 
+def validate_mutable_models(package_dir: Path, verbose: int = 0, *, isolate: bool = False) -> None:
+    _run_validators("mutable", package_dir, verbose=verbose, isolate=isolate)
 
-def validate_deep_frozen_models(package_dir: Path, base_symbol: str, verbose: int = 0) -> None:
-    pkg_name = package_dir.name
-    code = f"""
-import sys
-sys.path.insert(0, {str(package_dir.parent)!r})
-import pydantic
-
-pkg = __import__({pkg_name!r}, fromlist=['*'])
-FrozenModel = __import__({pkg_name!r}+'.frozen_base', fromlist=[{base_symbol!r}]).{base_symbol}
-
-# Check that all models subclass FrozenModel
-bad = []
-for name, obj in vars(pkg).items():
-    if isinstance(obj, type) and issubclass(obj, pydantic.BaseModel):
-        if obj.__module__.startswith(pkg_name) and obj is not FrozenModel:
-            if not issubclass(obj, FrozenModel):
-                bad.append(name)
-
-if bad:
-    raise SystemExit("Models not subclassing FrozenModel: " + ", ".join(sorted(bad)))
-
-# Deep-freeze probe
-class Probe(FrozenModel):
-    x: int
-    y: list[int]
-    z: dict[str, int]
-
-p = Probe(x=1, y=[1, 2], z={{"a": 1}})
-
-# Check deep freezing
-assert isinstance(p.y, tuple), f"list not frozen to tuple, got {{type(p.y)}}"
-assert not isinstance(p.z, dict) or not hasattr(p.z, '__setitem__'), "dict should be frozen"
-
-# Attribute mutation should fail
-try:
-    p.x = 2
-    raise AssertionError("Mutation should fail on lithified model")
-except (AttributeError, pydantic.ValidationError):
-    pass
-
-# Container mutation should also fail (deep freeze)
-try:
-    if hasattr(p.y, 'append'):
-        p.y.append(3)
-        raise AssertionError("Tuple should not have append method")
-except AttributeError:
-    pass
-
-print("OK")
-"""
 
-    if verbose:
-        typer.echo("[validate] checking deep-frozen models")
+def validate_frozen_models(package_dir: Path, base_symbol: str, verbose: int = 0, *, isolate: bool = False) -> None:
+    _run_validators("frozen", package_dir, base_symbol, verbose=verbose, isolate=isolate)
 
-    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
-    if r.returncode != 0:
-        typer.echo(r.stdout)
-        typer.secho(r.stderr, fg=typer.colors.RED)
-        raise typer.Exit(1)
 
-    if verbose:
-        typer.echo("[validate] deep-frozen models OK (lithified)")
+def validate_deep_frozen_models(
+    package_dir: Path, base_symbol: str, verbose: int = 0, *, isolate: bool = False
+) -> None:
+    _run_validators("deep-frozen", package_dir, base_symbol, verbose=verbose, isolate=isolate)
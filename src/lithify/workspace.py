@@ -22,12 +22,20 @@ def staging_dir(enabled: bool):
 
 def copy_selected(src_dir: Path, dst_dir: Path, patterns: Iterable[str]) -> list[Path]:
     dst_dir.mkdir(parents=True, exist_ok=True)
-    copied: list[Path] = []
+
+    # Overlapping patterns (e.g. "*.py" and "**/*.py") must not copy a file twice
+    sources: set[Path] = set()
     for pattern in patterns:
-        for p in src_dir.rglob(pattern):
-            rel = p.relative_to(src_dir)
-            target = dst_dir / rel
-            target.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(p, target)
-            copied.append(target)
+        sources.update(src_dir.rglob(pattern))
+
+    targets = {p: dst_dir / p.relative_to(src_dir) for p in sorted(sources)}
+    for parent in sorted({t.parent for t in targets.values()}, key=lambda d: len(d.parts)):
+        parent.mkdir(parents=True, exist_ok=True)
+
+    copied: list[Path] = []
+    for p, target in targets.items():
+        # Contents only: the staged files are fresh, so their timestamps and mode are not worth copying.
+        # copyfile already uses os.sendfile (Linux) / fcopyfile (macOS) for a kernel-side copy.
+        shutil.copyfile(p, target)
+        copied.append(target)
     return copied
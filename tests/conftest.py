@@ -0,0 +1,56 @@
+# tests/conftest.py
+
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--runslow", action="store_true", default=False, help="run tests marked slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(scope="session")
+def class_name_override_generation(tmp_path_factory):
+    """
+    Run `lithify generate` over fixtures/class_name_override once per session.
+
+    The CLI and end-to-end override tests only read the generated package, so they share this run
+    instead of each paying for a full datamodel-code-generator pass.
+    """
+    from typer.testing import CliRunner
+
+    from lithify import cli
+
+    fixture_dir = FIXTURES_DIR / "class_name_override"
+    if not fixture_dir.exists():
+        pytest.skip("Fixture schemas not available")
+
+    models_out = tmp_path_factory.mktemp("class_name_override") / "models"
+    result = CliRunner().invoke(
+        cli.app,
+        [
+            "generate",
+            "--schemas",
+            str(fixture_dir),
+            "--models-out",
+            str(models_out),
+            "--package-name",
+            "test_pkg",
+            "--format",
+            "none",
+            "-v",
+        ],
+    )
+    return SimpleNamespace(result=result, package_dir=models_out / "test_pkg")
@@ -7,6 +7,7 @@ import pytest
 from lithify.slas_allof_processor import (
     extract_uuid_version_set,
     process_allof_collapse,
+    resolve_allof_branches,
     try_uuid_pattern_specialization,
 )
 from lithify.slas_schema_index import SchemaIndex
@@ -28,6 +29,10 @@ class TestUUIDVersionExtraction:
         result = extract_uuid_version_set(pattern)
         assert result is None
 
+    def test_non_uuid_pattern_returns_none(self):
+        assert extract_uuid_version_set(r"^[a-z]+$") is None
+        assert extract_uuid_version_set(r"^[a-z]+-[0-9]{2}-[a-z]+$") is None
+
 
 class TestUUIDSpecialization:
     def test_v7_on_v1_7_base_specializes(self):
@@ -67,6 +72,26 @@ class TestUUIDSpecialization:
         assert "[1-5]" not in result
 
 
+class TestBranchResolution:
+    def test_ref_cache_reuses_resolved_node(self, tmp_path):
+        schema = {"$defs": {"Name": {"type": "string", "minLength": 1}}}
+        schema_file = tmp_path / "test.json"
+        schema_file.write_text(json.dumps(schema))
+        index = SchemaIndex.load([schema_file], schema_file.as_uri())
+        doc_uri = index.doc_uri_for_path(schema_file)
+
+        ref_cache = {}
+        branches = [{"$ref": "#/$defs/Name"}, {"maxLength": 10}]
+        first = resolve_allof_branches(branches, index, "#/properties/a", doc_uri, ref_cache)
+
+        assert ref_cache == {(doc_uri, "#/$defs/Name"): first[0]}
+
+        index.docs.clear()  # a cache hit must not touch the index
+        second = resolve_allof_branches(branches, index, "#/properties/b", doc_uri, ref_cache)
+
+        assert second[0] is first[0]
+
+
 class TestLenientMode:
     def test_conflict_warns_in_lenient_mode(self, tmp_path):
         schema = {
@@ -127,6 +152,23 @@ class TestFixpointCollapse:
         assert "allOf" not in result["$defs"]["Refined"]
         assert result["$defs"]["Refined"]["maxLength"] == 10
 
+    def test_collapse_updates_callers_index(self, tmp_path):
+        schema = {
+            "$defs": {
+                "Primitive": {"type": "string", "pattern": r"^[a-z]+$"},
+                "Base": {"allOf": [{"$ref": "#/$defs/Primitive"}, {"minLength": 3}]},
+            },
+        }
+        schema_file = tmp_path / "indexed.json"
+        schema_file.write_text(json.dumps(schema))
+        index = SchemaIndex.load([schema_file], schema_file.as_uri())
+
+        process_allof_collapse(tmp_path, index, strict=True, verbose=0)
+
+        base = index.node_for(f"{index.doc_uri_for_path(schema_file)}#/$defs/Base")
+        assert "allOf" not in base
+        assert base["minLength"] == 3
+
 
 class TestFixturedSchemas:
     """Test collapse using generic fixtures."""
@@ -145,7 +187,7 @@ class TestFixturedSchemas:
         # to the more specific UUIDv5 pattern.
         pass
 
-    def test_document_conflict_raises(self, tmp_path):
+    def test_document_conflict_raises(self):
         # Similar setup as above, copying the document_conflict.v1.yaml fixture.
         # The test would run process_allof_collapse in strict mode and assert that it
         # raises a RuntimeError containing the expected conflict message.
@@ -184,3 +226,41 @@ class TestValidationMode:
         assert "conflict" in errors[0].lower()
 
         assert schema_file.read_text() == original_content
+
+    def test_reads_documents_from_index(self, tmp_path):
+        schema = {
+            "$defs": {"Name": {"type": "string", "minLength": 5}},
+            "properties": {"name": {"allOf": [{"$ref": "#/$defs/Name"}, {"maxLength": 3}]}},
+        }
+        schema_file = tmp_path / "test.json"
+        schema_file.write_text(json.dumps(schema))
+
+        from lithify.validation import validate_allof_constraints
+
+        index = SchemaIndex.load([schema_file], schema_file.as_uri())
+        schema_file.write_text("not json")  # indexed documents are not parsed again
+
+        errors = validate_allof_constraints(tmp_path, index, strict=True)
+
+        assert len(errors) == 1
+        assert "test.json:#/properties/name" in errors[0]
+
+    def test_resolves_each_ref_once(self, tmp_path, monkeypatch):
+        schema = {
+            "$defs": {"Name": {"type": "string", "minLength": 1}},
+            "properties": {
+                field: {"allOf": [{"$ref": "#/$defs/Name"}, {"maxLength": 10}]} for field in ("first", "last", "nick")
+            },
+        }
+        schema_file = tmp_path / "test.json"
+        schema_file.write_text(json.dumps(schema))
+
+        from lithify.validation import validate_allof_constraints
+
+        index = SchemaIndex.load([schema_file], schema_file.as_uri())
+        lookups = []
+        node_for = index.node_for
+        monkeypatch.setattr(index, "node_for", lambda uri: lookups.append(uri) or node_for(uri))
+
+        assert validate_allof_constraints(tmp_path, index, strict=True) == []
+        assert len(lookups) == 1
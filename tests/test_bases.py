@@ -4,67 +4,70 @@ from pathlib import Path
 
 import pytest
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-class TestBases:
-    def test_inject_base_mutable(self, temp_dir):
-        from lithify.bases import inject_base
-
-        base_symbol, import_module = inject_base(temp_dir, mode="mutable", from_attributes=False)
-
-        assert base_symbol == "MutableBase"
-        assert import_module == "mutable_base"
-        assert (temp_dir / "mutable_base.py").exists()
-
-        content = (temp_dir / "mutable_base.py").read_text()
-        assert "class MutableBase(BaseModel):" in content
-        assert "validate_assignment=True" in content
-        assert "from_attributes=False" in content
-
-    def test_inject_base_frozen(self, temp_dir):
-        from lithify.bases import inject_base
-
-        base_symbol, import_module = inject_base(temp_dir, mode="frozen", from_attributes=True)
 
-        assert base_symbol == "FrozenBase"
-        assert import_module == "frozen_base"
-        assert (temp_dir / "frozen_base.py").exists()
-
-        content = (temp_dir / "frozen_base.py").read_text()
-        assert "class FrozenBase(BaseModel):" in content
-        assert "frozen=True" in content
-        assert "from_attributes=True" in content
-
-    def test_inject_base_deep_frozen(self, temp_dir):
+class TestBases:
+    @pytest.mark.parametrize(
+        "mode,use_frozendict,from_attrs,symbol,module,extras",
+        [
+            (
+                "mutable",
+                False,
+                False,
+                "MutableBase",
+                "mutable_base",
+                ["class MutableBase(BaseModel):", "validate_assignment=True", "from_attributes=False"],
+            ),
+            (
+                "frozen",
+                False,
+                True,
+                "FrozenBase",
+                "frozen_base",
+                ["class FrozenBase(BaseModel):", "frozen=True", "from_attributes=True"],
+            ),
+            (
+                "deep-frozen",
+                True,
+                False,
+                "FrozenModel",
+                "frozen_base",
+                [
+                    "class FrozenModel(BaseModel):",
+                    "_deep_freeze",
+                    "model_post_init",
+                    "from .frozendict import FrozenDict",
+                ],
+            ),
+            (
+                "deep-frozen",
+                False,
+                False,
+                "FrozenModel",
+                "frozen_base",
+                ["from types import MappingProxyType", "MappingProxyType"],
+            ),
+        ],
+        ids=["mutable", "frozen", "deep-frozen", "deep-frozen-no-frozendict"],
+    )
+    def test_inject_base(self, tmp_path, mode, use_frozendict, from_attrs, symbol, module, extras):
         from lithify.bases import inject_base
 
         base_symbol, import_module = inject_base(
-            temp_dir, mode="deep-frozen", use_frozendict=True, from_attributes=False
+            tmp_path, mode=mode, use_frozendict=use_frozendict, from_attributes=from_attrs
         )
 
-        assert base_symbol == "FrozenModel"
-        assert import_module == "frozen_base"
-        assert (temp_dir / "frozen_base.py").exists()
-        assert (temp_dir / "frozendict.py").exists()
-
-        content = (temp_dir / "frozen_base.py").read_text()
-        assert "class FrozenModel(BaseModel):" in content
-        assert "_deep_freeze" in content
-        assert "model_post_init" in content
-        assert "from .frozendict import FrozenDict" in content
-
-    def test_inject_base_deep_frozen_no_frozendict(self, temp_dir):
-        from lithify.bases import inject_base
-
-        base_symbol, import_module = inject_base(temp_dir, mode="deep-frozen", use_frozendict=False)
-
-        assert base_symbol == "FrozenModel"
-        assert not (temp_dir / "frozendict.py").exists()
+        assert base_symbol == symbol
+        assert import_module == module
+        assert (tmp_path / f"{module}.py").exists()
+        assert (tmp_path / "frozendict.py").exists() == (mode == "deep-frozen" and use_frozendict)
 
-        content = (temp_dir / "frozen_base.py").read_text()
-        assert "from types import MappingProxyType" in content
-        assert "MappingProxyType" in content
+        content = (tmp_path / f"{module}.py").read_text()
+        for extra in extras:
+            assert extra in content
 
-    def test_rebase_generated_models(self, temp_dir):
+    def test_rebase_generated_models(self, tmp_path):
         from lithify.bases import rebase_generated_models
 
         model1 = """from pydantic import BaseModel
@@ -78,71 +81,57 @@ class Event(BaseModel):
     id: int
 """
 
-        (temp_dir / "user.py").write_text(model1)
-        (temp_dir / "event.py").write_text(model2)
-        (temp_dir / "__init__.py").touch()
+        (tmp_path / "user.py").write_text(model1)
+        (tmp_path / "event.py").write_text(model2)
+        (tmp_path / "__init__.py").touch()
 
-        rebase_generated_models(temp_dir, "FrozenBase", "frozen_base")
+        rebase_generated_models(tmp_path, "FrozenBase", "frozen_base")
 
-        user_content = (temp_dir / "user.py").read_text()
+        user_content = (tmp_path / "user.py").read_text()
         assert "from .frozen_base import FrozenBase" in user_content
         assert "class User(FrozenBase):" in user_content
 
-        event_content = (temp_dir / "event.py").read_text()
+        event_content = (tmp_path / "event.py").read_text()
         assert "from .frozen_base import FrozenBase" in event_content
         assert "class Event(FrozenBase):" in event_content
 
-        init_content = (temp_dir / "__init__.py").read_text()
+        init_content = (tmp_path / "__init__.py").read_text()
         assert "FrozenBase" not in init_content
 
 
-@pytest.fixture
-def temp_dir():
-    import tempfile
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
-
-
-@pytest.fixture
-def fixtures_dir():
-    return Path(__file__).parent / "fixtures"
-
-
-@pytest.fixture
-def common_types_schema(fixtures_dir):
-    import yaml
-
-    with open(fixtures_dir / "common_types.yaml") as f:
-        return yaml.safe_load(f)
-
+@pytest.fixture(scope="session")
+def _schemas_template(tmp_path_factory):
+    """Fixture schemas mirrored to JSON once per session; indexed once per module via schema_index."""
+    import json
 
-@pytest.fixture
-def event_schema(fixtures_dir):
     import yaml
 
-    with open(fixtures_dir / "event.yaml") as f:
-        return yaml.safe_load(f)
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
 
+    schemas_dir = tmp_path_factory.mktemp("bases_schemas_tmpl")
 
-@pytest.fixture
-def temp_schemas_dir(tmp_path, common_types_schema, event_schema):
-    import json
+    for source, target in (("common_types.yaml", "00_common_types.json"), ("event.yaml", "01_event.json")):
+        with open(FIXTURES_DIR / source, "rb") as f:
+            schema = yaml.load(f, Loader=SafeLoader)
+        (schemas_dir / target).write_bytes(json.dumps(schema).encode())
 
-    schemas_dir = tmp_path / "schemas"
-    schemas_dir.mkdir()
+    return schemas_dir
 
-    common_types_path = schemas_dir / "00_common_types.json"
-    common_types_path.write_text(json.dumps(common_types_schema, indent=2))
 
-    event_path = schemas_dir / "01_event.json"
-    event_path.write_text(json.dumps(event_schema, indent=2))
+@pytest.fixture(scope="module")
+def schema_index(_schemas_template):
+    """Index over the session template; the alias emitters only read it, so one load serves every case."""
+    from lithify.slas_schema_index import SchemaIndex
 
-    return schemas_dir
+    return SchemaIndex.load(list(_schemas_template.glob("*.json")))
 
 
 class TestAliasGeneratorBaseClass:
-    def test_no_mutable_base_import(self, temp_schemas_dir, tmp_path):
+    @pytest.mark.parametrize("base_class", ["BaseModel", "FrozenModel", "MutableBase", "CustomBase"])
+    def test_no_mutable_base_import(self, base_class):
         from lithify.slas_alias_generator import generate_alias_module
 
         aliases = [
@@ -150,43 +139,37 @@ class TestAliasGeneratorBaseClass:
             ("SemVer", {"type": "string", "pattern": "^\\d+\\.\\d+\\.\\d+$"}, "scalar_str"),
         ]
 
-        for base_class in ["BaseModel", "FrozenModel", "MutableBase", "CustomBase"]:
-            code = generate_alias_module("test_module", aliases, "test_pkg", base_class, use_frozendict=False)
+        code = generate_alias_module("test_module", aliases, "test_pkg", base_class, use_frozendict=False)
 
-            assert "from typing import Annotated, Literal" in code
-            assert "from pydantic import Field, StringConstraints" in code
+        assert "from typing import Annotated, Literal" in code
+        assert "from pydantic import Field, StringConstraints" in code
 
-            if base_class == "BaseModel":
-                assert "from pydantic import BaseModel" in code
-            elif base_class == "FrozenModel":
-                assert "from .frozen_base import FrozenModel" in code
-            else:
-                assert "from .mutable_base" not in code
-                assert "MutableBase" not in code
+        if base_class == "BaseModel":
+            assert "from pydantic import BaseModel" in code
+        elif base_class == "FrozenModel":
+            assert "from .frozen_base import FrozenModel" in code
+        else:
+            assert "from .mutable_base" not in code
+            assert "MutableBase" not in code
 
-            assert "UUID = Annotated[str, StringConstraints(" in code
-            assert "SemVer = Annotated[str, StringConstraints(" in code
+        assert "UUID = Annotated[str, StringConstraints(" in code
+        assert "SemVer = Annotated[str, StringConstraints(" in code
 
-    def test_alias_module_with_all_base_classes(self, temp_schemas_dir, tmp_path):
+    @pytest.mark.parametrize("base_class", ["BaseModel", "FrozenModel", "MutableBase"])
+    def test_alias_module_with_all_base_classes(self, schema_index, tmp_path, base_class):
         from lithify.slas_alias_generator import emit_alias_modules
-        from lithify.slas_schema_index import SchemaIndex
-
-        index = SchemaIndex.load(list(temp_schemas_dir.glob("*.json")))
 
         output_dir = tmp_path / "output"
+        output_dir.mkdir()
 
-        for base_class in ["BaseModel", "FrozenModel", "MutableBase"]:
-            output_dir_test = output_dir / base_class.lower()
-            output_dir_test.mkdir(parents=True)
-
-            ref_map, modules_created = emit_alias_modules(
-                index, output_dir_test, "test_pkg", base_class, use_frozendict=False, verbose=0
-            )
+        ref_map, modules_created = emit_alias_modules(
+            schema_index, output_dir, "test_pkg", base_class, use_frozendict=False, verbose=0
+        )
 
-            for module_file in output_dir_test.glob("*.py"):
-                content = module_file.read_text()
+        for module_file in output_dir.glob("*.py"):
+            content = module_file.read_text()
 
-                assert "from .mutable_base" not in content, f"MutableBase import found in {module_file}"
+            assert "from .mutable_base" not in content, f"MutableBase import found in {module_file}"
 
-                if base_class == "FrozenModel":
-                    assert "from .frozen_base import FrozenModel" in content or "BaseModel" not in content
+            if base_class == "FrozenModel":
+                assert "from .frozen_base import FrozenModel" in content or "BaseModel" not in content
@@ -1,5 +1,7 @@
 # tests/test_class_name_rewriter.py
 
+import ast
+import copy
 import tempfile
 from pathlib import Path
 
@@ -10,8 +12,6 @@ from lithify.class_name_rewriter import (
     build_rename_map,
     rewrite_class_names,
 )
-from lithify.enums import FormatChoice, Mutability, OutputMode
-from lithify.orchestrator import GenerationConfig, SimpleReporter, run_generation
 from lithify.slas_schema_index import extract_class_name_override
 
 
@@ -56,82 +56,62 @@ def test_build_rename_map_with_sanitization():
         assert rename_map == {"User_Profile_V1": "UserProfile"}
 
 
-def test_class_name_rewriter_renames_class():
-    import ast
-
-    code = """
+_RENAME_SOURCES = {
+    "class": """
 class OldName(BaseModel):
     field: str
-"""
-
-    tree = ast.parse(code)
-    rewriter = ClassNameRewriter({"OldName": "NewName"})
-    new_tree = rewriter.visit(tree)
-
-    assert rewriter.changed
-    class_def = new_tree.body[0]
-    assert isinstance(class_def, ast.ClassDef)
-    assert class_def.name == "NewName"
-
-
-def test_class_name_rewriter_renames_references():
-    import ast
-
-    code = """
+""",
+    "references": """
 class OldName(BaseModel):
     pass
 
 class Other(BaseModel):
     ref: OldName
-"""
-
-    tree = ast.parse(code)
-    rewriter = ClassNameRewriter({"OldName": "NewName"})
-    new_tree = rewriter.visit(tree)
-
-    assert rewriter.changed
-    # Check both class and reference renamed
-    new_code = ast.unparse(new_tree)
-    assert "class NewName" in new_code
-    assert "ref: NewName" in new_code
-    assert "OldName" not in new_code
+""",
+    "imports": "from .models import OldName\n",
+    "base_classes": """
+class OldName(BaseModel):
+    pass
 
+class Child(OldName):
+    extra: str
+""",
+}
 
-def test_class_name_rewriter_renames_imports():
-    import ast
+# Parsed once at import; each test deep-copies its tree before rewriting
+_RENAME_TREES = {name: ast.parse(src, f"<rename-{name}>") for name, src in _RENAME_SOURCES.items()}
 
-    code = "from .models import OldName\n"
 
-    tree = ast.parse(code)
-    rewriter = ClassNameRewriter({"OldName": "NewName"})
-    new_tree = rewriter.visit(tree)
+def class_names(tree):
+    return {n.name for n in ast.walk(tree) if isinstance(n, ast.ClassDef)}
 
-    assert rewriter.changed
-    new_code = ast.unparse(new_tree)
-    assert "NewName" in new_code
-    assert "OldName" not in new_code
 
+def name_ids(tree):
+    return {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
 
-def test_class_name_rewriter_renames_base_classes():
-    import ast
 
-    code = """
-class OldName(BaseModel):
-    pass
+def imported_names(tree):
+    return {a.name for n in ast.walk(tree) if isinstance(n, ast.ImportFrom) for a in n.names}
 
-class Child(OldName):
-    extra: str
-"""
 
-    tree = ast.parse(code)
+@pytest.mark.parametrize(
+    "name,classes,names,imports",
+    [
+        ("class", {"NewName"}, {"BaseModel", "field", "str"}, set()),
+        ("references", {"NewName", "Other"}, {"BaseModel", "NewName", "ref"}, set()),
+        ("imports", set(), set(), {"NewName"}),
+        ("base_classes", {"NewName", "Child"}, {"BaseModel", "NewName", "extra", "str"}, set()),
+    ],
+)
+def test_class_name_rewriter_renames(name, classes, names, imports):
+    tree = copy.deepcopy(_RENAME_TREES[name])
     rewriter = ClassNameRewriter({"OldName": "NewName"})
     new_tree = rewriter.visit(tree)
 
     assert rewriter.changed
-    new_code = ast.unparse(new_tree)
-    assert "class NewName(BaseModel)" in new_code
-    assert "class Child(NewName)" in new_code
-    assert "OldName" not in new_code
+    assert class_names(new_tree) == classes
+    assert name_ids(new_tree) == names
+    assert imported_names(new_tree) == imports
 
 
 def test_rewrite_class_names_integration():
@@ -195,43 +175,12 @@ def test_rewrite_class_names_empty_overrides():
         assert modified == 0
 
 
+@pytest.mark.slow
 @pytest.mark.integration
-def test_end_to_end_with_override(tmp_path):
-    fixture_dir = Path(__file__).parent / "fixtures" / "class_name_override"
-    if not fixture_dir.exists():
-        pytest.skip("Fixture schemas not available")
-
-    models_out = tmp_path / "models"
-
-    cfg = GenerationConfig(
-        schemas=fixture_dir,
-        json_out=None,
-        models_out=models_out,
-        package_name="test_overrides",
-        exclude=None,
-        mutability=Mutability.mutable,
-        base_url=None,
-        block_remote_refs=False,
-        custom_ref_resolver=None,
-        immutable_hints=False,
-        use_frozendict=False,
-        from_attributes=False,
-        partial=False,
-        clean_first=False,
-        check=False,
-        verbose=2,
-        output_mode=OutputMode.clean,
-        fmt=FormatChoice.none,
-        no_rewrite=False,
-        dry_run=False,
-    )
-
-    reporter = SimpleReporter()
-    result = run_generation(cfg, reporter)
-
-    package_dir = result.package_dir
-
-    py_files = list(package_dir.glob("*.py"))
+def test_end_to_end_with_override(class_name_override_generation):
+    assert class_name_override_generation.result.exit_code == 0
+
+    py_files = list(class_name_override_generation.package_dir.glob("*.py"))
     model_files = [f for f in py_files if f.name not in {"__init__.py", "mutable_base.py"}]
     assert len(model_files) > 0
 
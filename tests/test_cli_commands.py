@@ -1,25 +1,20 @@
 # tests/test_cli_commands.py
 
 import json
-import subprocess
-import sys
-import tempfile
-from pathlib import Path
+import shutil
 
 import pytest
-import yaml
+from typer.testing import CliRunner
 
+from lithify import cli
 
-@pytest.fixture
-def temp_dir():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+runner = CliRunner()
 
 
-@pytest.fixture
-def sample_schemas(temp_dir):
-    schemas_dir = temp_dir / "schemas"
-    schemas_dir.mkdir()
+@pytest.fixture(scope="session")
+def _sample_schemas_template(tmp_path_factory):
+    """Schema tree written once per session; tests get their own copy via sample_schemas."""
+    schemas_dir = tmp_path_factory.mktemp("schemas_tmpl")
 
     user_schema = {
         "$schema": "https://json-schema.org/draft/2020-12/schema",
@@ -49,47 +44,36 @@ def sample_schemas(temp_dir):
         },
     }
 
-    (schemas_dir / "user.json").write_text(json.dumps(user_schema, indent=2))
-    (schemas_dir / "event.json").write_text(json.dumps(event_schema, indent=2))
-
-    (schemas_dir / "user.yaml").write_text(yaml.dump(user_schema))
-    (schemas_dir / "event.yaml").write_text(yaml.dump(event_schema))
+    (schemas_dir / "user.json").write_bytes(json.dumps(user_schema).encode())
+    (schemas_dir / "event.json").write_bytes(json.dumps(event_schema).encode())
 
     return schemas_dir
 
 
+@pytest.fixture
+def sample_schemas(tmp_path, _sample_schemas_template):
+    return shutil.copytree(_sample_schemas_template, tmp_path / "schemas")
+
+
 class TestCLI:
     def test_info_command(self):
-        result = subprocess.run([sys.executable, "-m", "lithify.cli", "info"], capture_output=True, text=True)
-        assert result.returncode == 0
+        result = runner.invoke(cli.app, ["info"])
+        assert result.exit_code == 0
         assert "Lithify Mutability Modes" in result.stdout
         assert "mutable" in result.stdout
         assert "frozen" in result.stdout
         assert "deep-frozen" in result.stdout
 
     def test_diagnose_command(self):
-        result = subprocess.run([sys.executable, "-m", "lithify.cli", "diagnose"], capture_output=True, text=True)
-        assert result.returncode == 0
+        result = runner.invoke(cli.app, ["diagnose"])
+        assert result.exit_code == 0
         assert "Dependencies" in result.stdout
 
-    def test_validate_command(self, sample_schemas, temp_dir):
-        json_out = temp_dir / "json"
-
-        result = subprocess.run(
-            [
-                sys.executable,
-                "-m",
-                "lithify.cli",
-                "validate",
-                "--schemas",
-                str(sample_schemas),
-                "--json-out",
-                str(json_out),
-            ],
-            capture_output=True,
-            text=True,
-        )
-        assert result.returncode == 0
+    def test_validate_command(self, sample_schemas, tmp_path):
+        json_out = tmp_path / "json"
+
+        result = runner.invoke(cli.app, ["validate", "--schemas", str(sample_schemas), "--json-out", str(json_out)])
+        assert result.exit_code == 0, result.output
         assert json_out.exists()
         assert (json_out / "user.json").exists()
         assert (json_out / "event.json").exists()
@@ -3,14 +3,19 @@ from __future__ import annotations
 
 import importlib
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 import typer.testing
 
+runner = typer.testing.CliRunner()
 
+
+@lru_cache(maxsize=1)
 def _require_cli():
+    # Modules are process-wide singletons, so one lookup serves every test; monkeypatch still patches them
     cli = importlib.import_module("lithify.cli")
     enums = importlib.import_module("lithify.enums")
     formatting = importlib.import_module("lithify.formatting")
@@ -18,7 +23,7 @@ def _require_cli():
     return SimpleNamespace(cli=cli, enums=enums, formatting=formatting, orchestrator=orchestrator)
 
 
-def _stub_generation(monkeypatch, package_name="models_pkg"):
+def _stub_generation(monkeypatch, mods):
     """
     Patch lithify.orchestrator.run_generation.
 
@@ -30,8 +35,6 @@ def _stub_generation(monkeypatch, package_name="models_pkg"):
 
     It returns the package dir, matching the CLI's expectation.
     """
-    mods = _require_cli()
-
     calls = {"rewrites": 0}
 
     def fake_apply_rewrites(_generated_root: Path):
@@ -76,8 +79,7 @@ def _stub_generation(monkeypatch, package_name="models_pkg"):
     return calls
 
 
-def _stub_formatter_to_noop(monkeypatch):
-    mods = _require_cli()
+def _stub_formatter_to_noop(monkeypatch, mods):
     recorded = []
 
     def fake_format_path(path: Path, choice, dry_run: bool = False) -> str:
@@ -88,12 +90,18 @@ def _stub_formatter_to_noop(monkeypatch):
     return recorded
 
 
-def test_generate_dry_run_prints_plan_and_creates_no_files(tmp_path: Path, monkeypatch):
+@pytest.fixture
+def stubs(monkeypatch):
+    """Generation and formatter stubs; `calls` counts rewrites and `formatted` records format_path calls."""
     mods = _require_cli()
-    runner = typer.testing.CliRunner()
+    return SimpleNamespace(
+        mods=mods,
+        calls=_stub_generation(monkeypatch, mods),
+        formatted=_stub_formatter_to_noop(monkeypatch, mods),
+    )
+
 
-    _stub_generation(monkeypatch, package_name="pkg")
-    _stub_formatter_to_noop(monkeypatch)
+def test_generate_dry_run_prints_plan_and_creates_no_files(tmp_path: Path, stubs):
 
     schemas = tmp_path / "schemas"
     schemas.mkdir()
@@ -101,7 +109,7 @@ def test_generate_dry_run_prints_plan_and_creates_no_files(tmp_path: Path, monke
     models_out = tmp_path / "out"
 
     result = runner.invoke(
-        mods.cli.app,
+        stubs.mods.cli.app,
         [
             "generate",
             "--schemas",
@@ -129,12 +137,7 @@ def test_generate_dry_run_prints_plan_and_creates_no_files(tmp_path: Path, monke
     assert not models_out.exists()
 
 
-def test_output_mode_clean_copies_only_py(tmp_path: Path, monkeypatch):
-    mods = _require_cli()
-    runner = typer.testing.CliRunner()
-
-    rewrite_calls = _stub_generation(monkeypatch, package_name="genpkg")
-    formatted = _stub_formatter_to_noop(monkeypatch)
+def test_output_mode_clean_copies_only_py(tmp_path: Path, stubs):
 
     schemas = tmp_path / "schemas"
     schemas.mkdir()
@@ -142,7 +145,7 @@ def test_output_mode_clean_copies_only_py(tmp_path: Path, monkeypatch):
     models_out = tmp_path / "clean_out"
 
     result = runner.invoke(
-        mods.cli.app,
+        stubs.mods.cli.app,
         [
             "generate",
             "--schemas",
@@ -166,17 +169,12 @@ def test_output_mode_clean_copies_only_py(tmp_path: Path, monkeypatch):
     assert not (models_out / "manifest.json").exists()
     assert not (models_out / "debug_map.json").exists()
 
-    assert rewrite_calls["rewrites"] == 1
+    assert stubs.calls["rewrites"] == 1
 
-    assert formatted and formatted[0][0] == str(pkg)
+    assert stubs.formatted and stubs.formatted[0][0] == str(pkg)
 
 
-def test_output_mode_debug_keeps_intermediates(tmp_path: Path, monkeypatch):
-    mods = _require_cli()
-    runner = typer.testing.CliRunner()
-
-    _stub_generation(monkeypatch, package_name="genpkg")
-    formatted = _stub_formatter_to_noop(monkeypatch)
+def test_output_mode_debug_keeps_intermediates(tmp_path: Path, stubs):
 
     schemas = tmp_path / "schemas"
     schemas.mkdir()
@@ -184,7 +182,7 @@ def test_output_mode_debug_keeps_intermediates(tmp_path: Path, monkeypatch):
     models_out = tmp_path / "debug_out"
 
     result = runner.invoke(
-        mods.cli.app,
+        stubs.mods.cli.app,
         [
             "generate",
             "--schemas",
@@ -207,15 +205,10 @@ def test_output_mode_debug_keeps_intermediates(tmp_path: Path, monkeypatch):
     assert (models_out / "manifest.json").exists()
     assert (models_out / "debug_map.json").exists()
 
-    assert formatted and formatted[0][0] == str(pkg)
+    assert stubs.formatted and stubs.formatted[0][0] == str(pkg)
 
 
-def test_no_rewrite_flag_skips_apply_rewrites(tmp_path: Path, monkeypatch):
-    mods = _require_cli()
-    runner = typer.testing.CliRunner()
-
-    calls = _stub_generation(monkeypatch, package_name="genpkg")
-    _ = _stub_formatter_to_noop(monkeypatch)
+def test_no_rewrite_flag_skips_apply_rewrites(tmp_path: Path, stubs):
 
     schemas = tmp_path / "schemas"
     schemas.mkdir()
@@ -223,7 +216,7 @@ def test_no_rewrite_flag_skips_apply_rewrites(tmp_path: Path, monkeypatch):
     models_out = tmp_path / "out"
 
     result1 = runner.invoke(
-        mods.cli.app,
+        stubs.mods.cli.app,
         [
             "generate",
             "--schemas",
@@ -237,10 +230,10 @@ def test_no_rewrite_flag_skips_apply_rewrites(tmp_path: Path, monkeypatch):
         ],
     )
     assert result1.exit_code == 0
-    assert calls["rewrites"] == 1
+    assert stubs.calls["rewrites"] == 1
 
     result2 = runner.invoke(
-        mods.cli.app,
+        stubs.mods.cli.app,
         [
             "generate",
             "--schemas",
@@ -255,27 +248,23 @@ def test_no_rewrite_flag_skips_apply_rewrites(tmp_path: Path, monkeypatch):
         ],
     )
     assert result2.exit_code == 0
-    assert calls["rewrites"] == 1
+    assert stubs.calls["rewrites"] == 1
 
 
-def test_format_auto_prefers_ruff(monkeypatch, tmp_path: Path):
-    mods = _require_cli()
-
-    monkeypatch.setattr(mods.formatting, "_have", lambda c: c == "ruff", raising=True)
+@pytest.fixture
+def noop_subprocess(monkeypatch):
     monkeypatch.setattr(subprocess, "run", lambda *a, **k: SimpleNamespace(returncode=0))
 
-    msg = mods.formatting.format_path(tmp_path, mods.enums.FormatChoice.auto, dry_run=False)
-    assert "ruff" in msg
-
 
-def test_format_auto_falls_back_to_black(monkeypatch, tmp_path: Path):
+@pytest.mark.usefixtures("noop_subprocess")
+@pytest.mark.parametrize("tool", ["ruff", "black"])
+def test_format_auto_picks_available_tool(monkeypatch, tmp_path: Path, tool):
     mods = _require_cli()
 
-    monkeypatch.setattr(mods.formatting, "_have", lambda c: c == "black", raising=True)
-    monkeypatch.setattr(subprocess, "run", lambda *a, **k: SimpleNamespace(returncode=0))
+    monkeypatch.setattr(mods.formatting, "_have", lambda c: c == tool, raising=True)
 
     msg = mods.formatting.format_path(tmp_path, mods.enums.FormatChoice.auto, dry_run=False)
-    assert "black" in msg
+    assert f"format: ran {tool}" in msg
 
 
 def test_format_none_skips(monkeypatch, tmp_path: Path):
@@ -289,40 +278,14 @@ def test_format_none_skips(monkeypatch, tmp_path: Path):
     assert "skipped" in msg
 
 
-def test_generate_with_class_name_override(tmp_path: Path):
-    from pathlib import Path
-
-    from typer.testing import CliRunner
-
-    mods = _require_cli()
-    runner = CliRunner()
-
-    fixture_dir = Path(__file__).parent / "fixtures" / "class_name_override"
-    if not fixture_dir.exists():
-        pytest.skip("Fixture schemas not available")
-
-    models_out = tmp_path / "models"
-
-    result = runner.invoke(
-        mods.cli.app,
-        [
-            "generate",
-            "--schemas",
-            str(fixture_dir),
-            "--models-out",
-            str(models_out),
-            "--package-name",
-            "test_pkg",
-            "--format",
-            "none",
-            "-v",
-        ],
-    )
+@pytest.mark.slow
+def test_generate_with_class_name_override(class_name_override_generation):
+    result = class_name_override_generation.result
 
     assert result.exit_code == 0, f"Generation failed: {result.stdout}"
     assert "Applying class name overrides" in result.stdout
 
-    py_files = list((models_out / "test_pkg").glob("*.py"))
+    py_files = list(class_name_override_generation.package_dir.glob("*.py"))
     model_files = [f for f in py_files if f.name not in {"__init__.py", "mutable_base.py"}]
 
     assert len(model_files) > 0, "No model files generated"
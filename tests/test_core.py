@@ -4,8 +4,10 @@ import json
 import subprocess
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+import typer
 import yaml
 
 from lithify.core import (
@@ -42,6 +44,9 @@ class TestCore:
         assert "test.schema.json" in schema_map
         assert "test.json" in schema_map
 
+        # A pre-walked source list yields the same map as scanning the tree
+        assert build_schema_map(temp_dir, sorted(temp_dir.glob("*.y*ml"))) == schema_map
+
     def test_rewrite_single_ref(self):
         schema_map = {"user.schema.json": "01_user.json", "user.json": "01_user.json"}
         base_url = "https://example.com/schemas/"
@@ -84,6 +89,23 @@ class TestCore:
         assert result["allOf"][1]["properties"]["nested"]["items"]["$ref"] == "./01_user.json#/definitions/Name"
         assert result["definitions"]["Local"]["$ref"] == "#/definitions/Other"
 
+    def test_rewrite_remote_refs_shared_cache(self, monkeypatch):
+        import lithify.core as core
+
+        calls = []
+        real = core._rewrite_single_ref
+        monkeypatch.setattr(core, "_rewrite_single_ref", lambda ref, *a: calls.append(ref) or real(ref, *a))
+
+        schema_map = {"user.json": "01_user.json"}
+        doc = {"items": [{"$ref": "user.json"}, {"$ref": "user.json"}], "not": {"$ref": "#/x"}}
+        cache = {}
+        first = rewrite_remote_refs(doc, schema_map, None, cache)
+        second = rewrite_remote_refs(doc, schema_map, None, cache)
+
+        assert first == second
+        assert first["items"][1]["$ref"] == "./01_user.json"
+        assert sorted(calls) == ["#/x", "user.json"]
+
     def test_iter_refs(self):
         schema = {
             "$ref": "./top.json",
@@ -104,6 +126,15 @@ class TestCore:
         assert "./item.json" in refs
         assert len(refs) == 5
 
+    def test_iter_refs_document_order_and_depth(self):
+        schema = {"allOf": [{"$ref": "./a.json"}, {"items": {"$ref": "./b.json"}}], "not": {"$ref": "./c.json"}}
+        assert list(_iter_refs(schema)) == ["./a.json", "./b.json", "./c.json"]
+
+        deep = {"$ref": "./leaf.json"}
+        for _ in range(5000):
+            deep = {"items": [deep]}
+        assert list(_iter_refs(deep)) == ["./leaf.json"]
+
     def test_validate_schema_consistency_missing_ref(self, temp_dir):
         schema = {"properties": {"user": {"$ref": "./missing.json"}}}
         (temp_dir / "test.json").write_text(json.dumps(schema))
@@ -111,6 +142,36 @@ class TestCore:
         with pytest.raises((SystemExit, Exception)):
             validate_schema_consistency(temp_dir)
 
+    def test_validate_schema_consistency_shared_missing_ref_reported_per_use(self, temp_dir, capsys):
+        for name in ("a", "b"):
+            schema = {"properties": {"x": {"$ref": "./missing.json#/x"}, "y": {"$ref": "./missing.json#/y"}}}
+            (temp_dir / f"{name}.json").write_text(json.dumps(schema))
+
+        with pytest.raises(typer.Exit):
+            validate_schema_consistency(temp_dir)
+
+        errors = [line for line in capsys.readouterr().out.splitlines() if "[missing-ref]" in line]
+        assert len(errors) == 4
+        assert "a.json: './missing.json#/y' -> 'missing.json' not found" in errors[1]
+
+    def test_validate_schema_consistency_large_tree_on_pool(self, temp_dir, monkeypatch, capsys):
+        import lithify.core as core
+
+        for i in range(20):
+            schema = {"properties": {"next": {"$ref": f"./{(i + 1) % 20:02d}.json#/properties"}}}
+            (temp_dir / f"{i:02d}.json").write_text(json.dumps(schema))
+        (temp_dir / "05.json").write_text("{not json")
+        (temp_dir / "07.json").write_text(json.dumps({"$ref": "./missing.json"}))
+        monkeypatch.setattr(core.os, "cpu_count", lambda: 2)
+
+        with pytest.raises(typer.Exit):
+            validate_schema_consistency(temp_dir)
+
+        errors = [line for line in capsys.readouterr().out.splitlines() if line.startswith("Error:")]
+        assert len(errors) == 2
+        assert "[invalid-json] 05.json" in errors[0]
+        assert "[missing-ref] 07.json: './missing.json'" in errors[1]
+
     def test_validate_schema_consistency_circular_ok(self, temp_dir):
         schema1 = {"properties": {"other": {"$ref": "./schema2.json"}}}
         schema2 = {"properties": {"back": {"$ref": "./schema1.json"}}}
@@ -173,6 +234,94 @@ class TestCoreModuleCoverage:
         v1_data = json.loads((json_out / "v1" / "user.json").read_text())
         assert v1_data["version"] == 1
 
+    def test_mirror_large_tree_matches_serial(self, temp_dir, monkeypatch):
+        import lithify.core as core
+        import lithify.utils as utils
+
+        schemas = temp_dir / "schemas"
+        schemas.mkdir()
+        for i in range(20):
+            schema = {"properties": {"u": {"$ref": "user.json"}, "w": {"const": 0.5}}, "version": i}
+            suffix = "yaml" if i % 2 else "json"
+            text = yaml.dump(schema) if i % 2 else json.dumps(schema)
+            (schemas / f"{i:02d}_model.{suffix}").write_text(text)
+        (schemas / "user.yaml").write_text(yaml.dump({"type": "object"}))
+
+        with monkeypatch.context() as m:
+            m.setattr(core.os, "cpu_count", lambda: 2)
+            pooled = mirror_yaml_to_json(schemas, temp_dir / "pooled", None)
+        monkeypatch.setattr(utils, "_PARALLEL_MIN_TASKS", 10**6)
+        serial = mirror_yaml_to_json(schemas, temp_dir / "serial", None)
+
+        assert [p.name for p in pooled] == [p.name for p in serial]
+        assert len(pooled) == 21
+        for p, q in zip(pooled, serial, strict=True):
+            assert p.read_text() == q.read_text()
+        data = json.loads((temp_dir / "pooled" / "01_model.json").read_text())
+        assert data["properties"]["u"]["$ref"] == "./user.json"
+        assert data["properties"]["w"]["minimum"] == 0.5
+
+    def test_mirror_keeps_wide_integer_bounds(self, temp_dir):
+        schemas = temp_dir / "schemas"
+        schemas.mkdir()
+        wide = 123456789012345678901234567890
+        (schemas / "big.json").write_text(f'{{"type": "integer", "maximum": {wide}}}')
+        (schemas / "big_yaml.yaml").write_text(f"type: integer\nmaximum: {wide}\n")
+
+        mirror_yaml_to_json(schemas, temp_dir / "out", None)
+
+        for name in ("big.json", "big_yaml.json"):
+            text = (temp_dir / "out" / name).read_text()
+            assert f'"maximum": {wide}' in text
+            assert json.loads(text)["maximum"] == wide
+
+    def test_mirror_keeps_non_finite_bounds(self, temp_dir):
+        schemas = temp_dir / "schemas"
+        schemas.mkdir()
+        (schemas / "bounds.yaml").write_text("type: number\nmaximum: .inf\nminimum: -.inf\n")
+        (schemas / "bounds_json.json").write_text('{"type": "number", "maximum": Infinity, "minimum": -Infinity}')
+
+        mirror_yaml_to_json(schemas, temp_dir / "out", None)
+
+        for name in ("bounds.json", "bounds_json.json"):
+            text = (temp_dir / "out" / name).read_text()
+            assert '"maximum": Infinity' in text
+            assert '"minimum": -Infinity' in text
+            assert "null" not in text
+
+    def test_mirror_const_prescan(self, temp_dir):
+        schemas = temp_dir / "schemas"
+        schemas.mkdir()
+        (schemas / "plain.json").write_text('{"properties": {"a": {"$ref": "x.schema.json", "minimum": 0.5}}}')
+        (schemas / "escaped.json").write_text('{"properties": {"a": {"\\u0063onst": 0.5}}}')
+        (schemas / "utf16.yaml").write_bytes("properties:\n  a: {const: 1}\n".encode("utf-16"))
+
+        mirror_yaml_to_json(schemas, temp_dir / "out", None)
+
+        def load(name):
+            return json.loads((temp_dir / "out" / name).read_text())
+
+        assert load("plain.json") == {"properties": {"a": {"$ref": "./x.json", "minimum": 0.5}}}
+        assert load("escaped.json")["properties"]["a"] == {"type": "number", "minimum": 0.5, "maximum": 0.5}
+        assert load("utf16.json")["properties"]["a"] == {"enum": [1], "type": "integer"}
+
+    def test_mirror_yaml_with_aliases(self, temp_dir):
+        (temp_dir / "01_user.yaml").write_text("type: object\n")
+        (temp_dir / "model.yaml").write_text(
+            "properties:\n"
+            "  a: &shared {$ref: user.json, const: 0.5}\n"
+            "  b: *shared\n"
+            "examples:\n"
+            "  - *shared\n"
+        )
+
+        mirror_yaml_to_json(temp_dir, temp_dir / "json", None)
+
+        data = json.loads((temp_dir / "json" / "model.json").read_text())
+        fixed = {"$ref": "./01_user.json", "type": "number", "minimum": 0.5, "maximum": 0.5}
+        assert data["properties"] == {"a": fixed, "b": fixed}
+        assert data["examples"] == [{"$ref": "./01_user.json", "const": 0.5}]
+
     def test_mirror_with_yml_extension(self, temp_dir):
         schema = {"type": "string"}
         (temp_dir / "test.yml").write_text(yaml.dump(schema))
@@ -346,6 +495,34 @@ class TestConstToEnumRewriting:
         assert out["enum"] == [False]
         assert out["type"] == "boolean"
 
+    def test_fused_transform_matches_separate_passes(self):
+        import copy
+
+        from lithify.core import _transform_schema, rewrite_const_to_enum
+
+        schema = {
+            "properties": {
+                "user": {"$ref": "user.json", "const": "x"},
+                "ratio": {"enum": [0.5]},
+                "tags": {"items": {"const": 1, "enum": [2]}},
+            },
+            "examples": [{"const": 0.3, "$ref": "user.json"}],
+            "$defs": {"Weight": {"const": 0.3}},
+        }
+        schema_map = {"user.json": "01_user.json"}
+
+        expected = rewrite_const_to_enum(rewrite_remote_refs(copy.deepcopy(schema), schema_map, None))
+        fused = _transform_schema(schema, schema_map, None, {}, fix_const=True)
+
+        assert fused == expected
+        assert fused["examples"][0] == {"const": 0.3, "$ref": "./01_user.json"}  # data, not schema
+        assert fused["properties"]["tags"]["items"]["enum"] == [2, 1]
+        assert schema["$defs"]["Weight"] == {"const": 0.3}  # input left untouched
+
+        in_place = _transform_schema(schema, schema_map, None, {}, fix_const=True, in_place=True)
+        assert in_place is schema
+        assert in_place == expected
+
     def test_scientific_notation_preserved(self):
         import copy
 
@@ -391,13 +568,7 @@ class TestDCGFlags:
 
         def mock_run(cmd, *args, **kwargs):
             commands_run.append(cmd)
-
-            class Result:
-                returncode = 0
-                stdout = ""
-                stderr = ""
-
-            return Result()
+            return SimpleNamespace(returncode=0, stdout="", stderr="")
 
         monkeypatch.setattr(subprocess, "run", mock_run)
 
@@ -405,18 +576,28 @@ class TestDCGFlags:
         json_dir.mkdir()
         (json_dir / "test.json").write_text('{"type": "object"}')
 
-        try:
-            run_datamodel_codegen(json_dir, temp_dir, "test_pkg")
-        except Exception:
-            pass
+        run_datamodel_codegen(json_dir, temp_dir, "test_pkg")
 
         assert len(commands_run) == 1
         cmd = commands_run[0]
+        assert cmd[cmd.index("--input") + 1] == str(json_dir)
         assert "--enum-field-as-literal" in cmd
         assert "one" in cmd[cmd.index("--enum-field-as-literal") + 1]
         assert "--use-title-as-name" in cmd
         assert "--reuse-model" in cmd
 
+    def test_dcg_failure_reports_output(self, temp_dir, monkeypatch, capsys):
+        from lithify.core import run_datamodel_codegen
+
+        monkeypatch.setattr(
+            subprocess, "run", lambda *a, **k: SimpleNamespace(returncode=2, stdout="", stderr="bad schema")
+        )
+
+        with pytest.raises(typer.Exit):
+            run_datamodel_codegen(temp_dir, temp_dir, "test_pkg")
+
+        assert "bad schema" in capsys.readouterr().out
+
 
 class TestExcludeFilter:
     def test_exclude_directories(self, temp_dir):
@@ -56,12 +56,12 @@ class TestErrorHandling:
 
         validate_schema_consistency(temp_dir)
 
-    def test_invalid_base_url(self, temp_dir):
+    def test_invalid_base_url(self):
         result = _rewrite_single_ref("https://example.com/schema.json", "not-a-valid-url", {})
 
         assert result is not None
 
-    def test_datamodel_codegen_failure(self, temp_dir, monkeypatch):
+    def test_datamodel_codegen_failure(self, temp_dir):
         from lithify.core import run_datamodel_codegen
 
         (temp_dir / "test.json").write_text('{"type": "object"}')
@@ -124,7 +124,7 @@ class TestEdgeCases:
 
         validate_schema_consistency(temp_dir)
 
-    def test_special_schema_names(self, temp_dir):
+    def test_special_schema_names(self):
         from lithify.sanitizer import safe_module_slug
 
         assert safe_module_slug("class") == "class_mod"
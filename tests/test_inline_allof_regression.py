@@ -1,14 +1,50 @@
 # tests/test_inline_allof_regression.py
 
+import json
+
 from lithify.enums import FormatChoice, Mutability, OutputMode
 from lithify.orchestrator import GenerationConfig, SimpleReporter, run_generation
 
 
+def _generate(tmp_path, filename, schema, mutability, verbose=0):
+    """Run the full pipeline over a single schema and return the generated package dir."""
+    schemas_dir = tmp_path / "schemas"
+    schemas_dir.mkdir()
+    (schemas_dir / filename).write_text(json.dumps(schema))
+
+    models_out = tmp_path / "models"
+    cfg = GenerationConfig(
+        schemas=schemas_dir,
+        json_out=None,
+        models_out=models_out,
+        package_name="test_models",
+        exclude=None,
+        mutability=mutability,
+        base_url=None,
+        block_remote_refs=False,
+        custom_ref_resolver=None,
+        immutable_hints=False,
+        use_frozendict=False,
+        from_attributes=False,
+        partial=False,
+        clean_first=False,
+        check=False,
+        verbose=verbose,
+        output_mode=OutputMode.clean,
+        fmt=FormatChoice.none,
+        no_rewrite=False,
+        dry_run=False,
+        lenient_allof=False,
+    )
+    run_generation(cfg, SimpleReporter())
+
+    package_dir = models_out / "test_models"
+    assert package_dir.exists()
+    return package_dir
+
+
 class TestPR02Regression:
     def test_full_pipeline_with_inline_allof(self, tmp_path):
-        schemas_dir = tmp_path / "schemas"
-        schemas_dir.mkdir()
-
         schema = {
             "$schema": "https://json-schema.org/draft/2020-12/schema",
             "title": "User",
@@ -23,42 +59,7 @@ class TestPR02Regression:
             "required": ["user_id", "username"],
         }
 
-        schema_file = schemas_dir / "user.yaml"
-        import yaml
-
-        schema_file.write_text(yaml.dump(schema))
-
-        models_out = tmp_path / "models"
-
-        cfg = GenerationConfig(
-            schemas=schemas_dir,
-            json_out=None,
-            models_out=models_out,
-            package_name="test_models",
-            exclude=None,
-            mutability=Mutability.deep_frozen,
-            base_url=None,
-            block_remote_refs=False,
-            custom_ref_resolver=None,
-            immutable_hints=False,
-            use_frozendict=False,
-            from_attributes=False,
-            partial=False,
-            clean_first=False,
-            check=False,
-            verbose=2,
-            output_mode=OutputMode.clean,
-            fmt=FormatChoice.none,
-            no_rewrite=False,
-            dry_run=False,
-            lenient_allof=False,
-        )
-
-        reporter = SimpleReporter()
-        run_generation(cfg, reporter)
-
-        package_dir = models_out / "test_models"
-        assert package_dir.exists()
+        package_dir = _generate(tmp_path, "user.json", schema, Mutability.deep_frozen, verbose=2)
 
         user_model_file = package_dir / "user.py"
         assert user_model_file.exists()
@@ -80,9 +81,6 @@ class TestPR02Regression:
         assert "User_username" not in user_types_content, "No alias for regular fields"
 
     def test_no_regression_on_regular_fields(self, tmp_path):
-        schemas_dir = tmp_path / "schemas"
-        schemas_dir.mkdir()
-
         schema = {
             "$schema": "https://json-schema.org/draft/2020-12/schema",
             "title": "Product",
@@ -91,42 +89,7 @@ class TestPR02Regression:
             "required": ["name", "price"],
         }
 
-        schema_file = schemas_dir / "product.yaml"
-        import yaml
-
-        schema_file.write_text(yaml.dump(schema))
-
-        models_out = tmp_path / "models"
-
-        cfg = GenerationConfig(
-            schemas=schemas_dir,
-            json_out=None,
-            models_out=models_out,
-            package_name="test_models",
-            exclude=None,
-            mutability=Mutability.mutable,
-            base_url=None,
-            block_remote_refs=False,
-            custom_ref_resolver=None,
-            immutable_hints=False,
-            use_frozendict=False,
-            from_attributes=False,
-            partial=False,
-            clean_first=False,
-            check=False,
-            verbose=0,
-            output_mode=OutputMode.clean,
-            fmt=FormatChoice.none,
-            no_rewrite=False,
-            dry_run=False,
-            lenient_allof=False,
-        )
-
-        reporter = SimpleReporter()
-        run_generation(cfg, reporter)
-
-        package_dir = models_out / "test_models"
-        assert package_dir.exists()
+        package_dir = _generate(tmp_path, "product.json", schema, Mutability.mutable)
 
         product_file = package_dir / "product.py"
         assert product_file.exists()
@@ -142,9 +105,6 @@ class TestPR02Regression:
         assert "Product_price" not in content
 
     def test_no_regression_on_named_defs(self, tmp_path):
-        schemas_dir = tmp_path / "schemas"
-        schemas_dir.mkdir()
-
         schema = {
             "$schema": "https://json-schema.org/draft/2020-12/schema",
             "title": "Record",
@@ -159,42 +119,7 @@ class TestPR02Regression:
             "required": ["id", "name"],
         }
 
-        schema_file = schemas_dir / "record.yaml"
-        import yaml
-
-        schema_file.write_text(yaml.dump(schema))
-
-        models_out = tmp_path / "models"
-
-        cfg = GenerationConfig(
-            schemas=schemas_dir,
-            json_out=None,
-            models_out=models_out,
-            package_name="test_models",
-            exclude=None,
-            mutability=Mutability.deep_frozen,
-            base_url=None,
-            block_remote_refs=False,
-            custom_ref_resolver=None,
-            immutable_hints=False,
-            use_frozendict=False,
-            from_attributes=False,
-            partial=False,
-            clean_first=False,
-            check=False,
-            verbose=0,
-            output_mode=OutputMode.clean,
-            fmt=FormatChoice.none,
-            no_rewrite=False,
-            dry_run=False,
-            lenient_allof=False,
-        )
-
-        reporter = SimpleReporter()
-        run_generation(cfg, reporter)
-
-        package_dir = models_out / "test_models"
-        assert package_dir.exists()
+        package_dir = _generate(tmp_path, "record.json", schema, Mutability.deep_frozen)
 
         record_file = package_dir / "record.py"
         assert record_file.exists()
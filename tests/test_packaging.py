@@ -60,7 +60,7 @@ def sample_schemas(temp_dir):
 
 
 class TestJSONPointerEscapes:
-    def test_pointer_escapes_in_defs(self, temp_dir):
+    def test_pointer_escapes_in_defs(self):
         from lithify.slas_schema_index import resolve_pointer
 
         schema = {
@@ -7,10 +7,12 @@ from pathlib import Path
 import pytest
 from pydantic import ValidationError
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "pattern_properties"
+
 
 @pytest.fixture
 def fixtures_dir() -> Path:
-    return Path(__file__).parent / "fixtures" / "pattern_properties"
+    return FIXTURES_DIR
 
 
 class TestPatternPropertiesFullPipeline:
@@ -142,7 +142,7 @@ class TestSanitizer:
             assert mapped != "__init__.json"
             assert not mapped.startswith("__init__")
 
-    def test_rewrite_refs(self, temp_dir):
+    def test_rewrite_refs(self):
         name_map = {"01_user.json": "user.json", "02_audit.json": "audit.json"}
 
         schema = {
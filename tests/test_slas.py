@@ -1,6 +1,7 @@
 # tests/test_slas.py
 
 import json
+import sys
 from pathlib import Path
 
 import pytest
@@ -25,14 +26,18 @@ from lithify.slas_field_mapper import (
     sanitize_field_name,
 )
 from lithify.slas_rewriter import (
+    rewrite_all_modules,
     rewrite_module_with_aliases,
 )
-from lithify.slas_schema_index import SchemaIndex, resolve_pointer, resolve_uri
+from lithify.slas_schema_index import SchemaIndex, intern_schema_object, resolve_pointer, resolve_uri
+from lithify.slas_schema_processor import remove_scalar_defs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
 
 @pytest.fixture
 def fixtures_dir():
-    return Path(__file__).parent / "fixtures"
+    return FIXTURES_DIR
 
 
 @pytest.fixture
@@ -106,6 +111,42 @@ class TestSchemaIndex:
         assert version_node["type"] == "string"
         assert "pattern" in version_node
 
+    def test_intern_schema_object(self):
+        text = json.dumps(
+            {
+                "properties": {
+                    "id": {"type": "string", "format": "uuid", "title": "Some id"},
+                    "n": {"type": ["integer", "null"]},
+                }
+            }
+        )
+
+        result = json.loads(text, object_pairs_hook=intern_schema_object)
+
+        assert result == json.loads(text)
+        prop = result["properties"]["id"]
+        type_key = next(k for k in prop if k == "type")
+        assert type_key is sys.intern("type")
+        assert prop["format"] is sys.intern("uuid")
+        assert result["properties"]["n"]["type"][1] is sys.intern("null")
+
+    def test_update_reindexes_changed_file(self, tmp_path):
+        schema_file = tmp_path / "doc.json"
+        schema_file.write_text(json.dumps({"$defs": {"Old": {"type": "string", "$anchor": "old"}}}))
+        other_file = tmp_path / "other.json"
+        other_file.write_text(json.dumps({"$defs": {"Kept": {"type": "integer"}}}))
+        index = SchemaIndex.load([schema_file, other_file])
+        old_node = index.node_for("lithify:///doc.json#/$defs/Old")
+
+        schema_file.write_text(json.dumps({"$defs": {"New": {"type": "number"}}}))
+        index.update([schema_file])
+
+        assert index.node_for("lithify:///doc.json#/$defs/Old") is None
+        assert index.node_for("lithify:///doc.json#old") is None
+        assert index.node_for("lithify:///doc.json#/$defs/New") == {"type": "number"}
+        assert index.node_for("lithify:///other.json#/$defs/Kept") == {"type": "integer"}
+        assert id(old_node) not in index.subschema_bases
+
     def test_exportables(self, temp_schemas_dir):
         index = SchemaIndex.load(list(temp_schemas_dir.glob("*.json")), base_url="https://example.com/schemas/core/v1/")
 
@@ -378,6 +419,42 @@ class TestFieldMapping:
         assert sanitize_field_name("class") == "class_"
         assert sanitize_field_name("from") == "from_"
 
+    def test_build_field_map_nsint_uses_indexed_docs(self, tmp_path, monkeypatch):
+        import lithify.slas_field_mapper as slas_field_mapper
+
+        schemas_dir = tmp_path / "schemas"
+        schemas_dir.mkdir()
+        schema_file = schemas_dir / "event.json"
+        schema = {
+            "title": "Event",
+            "type": "object",
+            "properties": {"timestamp_ns": {"type": "string", "pattern": "^[0-9]+$"}},
+        }
+        schema_file.write_text(json.dumps(schema))
+        index = SchemaIndex.load([schema_file])
+
+        reads = []
+        monkeypatch.setattr(slas_field_mapper, "load_json_file", lambda path: reads.append(path))
+        field_map = build_field_map(index, {}, schemas_dir, verbose=0, package_name="pkg")
+
+        assert field_map["Event.timestamp_ns"].alias_fqn.endswith(".NsInt")
+        assert reads == []  # mapping came from the index, not a second read
+
+    def test_build_field_map_nsint_reads_files_missing_from_index(self, tmp_path):
+        schemas_dir = tmp_path / "schemas"
+        schemas_dir.mkdir()
+        ns_prop = {"type": "string", "pattern": "^[0-9]+$"}
+        for title in ("First", "Second"):
+            schema = {"$id": "https://example.com/shared.json", "title": title, "properties": {"at_ns": ns_prop}}
+            (schemas_dir / f"{title.lower()}.json").write_text(json.dumps(schema))
+        index = SchemaIndex.load(sorted(schemas_dir.glob("*.json")))
+        assert len(index.docs) == 1  # one document per $id
+
+        field_map = build_field_map(index, {}, schemas_dir, verbose=0, package_name="pkg")
+
+        assert field_map["First.at_ns"].alias_fqn.endswith(".NsInt")
+        assert field_map["Second.at_ns"].alias_fqn.endswith(".NsInt")
+
     def test_build_field_map(self, temp_schemas_dir, tmp_path):
         index = SchemaIndex.load(list(temp_schemas_dir.glob("*.json")), base_url="https://example.com/schemas/core/v1/")
 
@@ -529,6 +606,29 @@ class TestFieldMapping:
         assert "RecordV1.record_id" not in field_map, "Should NOT use schema title when override present"
 
 
+class TestScalarDefRemoval:
+    def test_removes_handled_defs_and_refs_to_emptied_files(self, tmp_path):
+        types_file = tmp_path / "types.json"
+        types_file.write_text(json.dumps({"title": "Types", "type": "object", "$defs": {"Id": {"type": "string"}}}))
+        model_file = tmp_path / "model.json"
+        model = {
+            "title": "Model",
+            "type": "object",
+            "properties": {"id": {"$ref": "types.json#/$defs/Id"}, "n": {"type": "integer"}},
+        }
+        model_file.write_text(json.dumps(model))
+        untouched = tmp_path / "other.json"
+        untouched.write_text('{"title": "Other", "type": "object"}')
+
+        remove_scalar_defs(tmp_path, {"types": ["Id"]})
+
+        assert not types_file.exists()
+        result = json.loads(model_file.read_text())
+        assert result["properties"]["id"] == {"type": "string"}
+        assert result["properties"]["n"] == {"type": "integer"}
+        assert untouched.read_text() == '{"title": "Other", "type": "object"}'
+
+
 class TestEndToEnd:
     def test_full_pipeline(self, temp_schemas_dir, tmp_path):
         index = SchemaIndex.load(list(temp_schemas_dir.glob("*.json")), base_url="https://example.com/schemas/core/v1/")
@@ -641,7 +741,49 @@ class TestModel(BaseModel):
         assert "id: str" not in rewritten
         assert "digest: str" not in rewritten
 
-    def test_cli_integration(self, temp_schemas_dir, tmp_path):
+    def test_rewrite_all_modules_only_touches_modules_naming_targets(self, tmp_path):
+        from lithify.slas_field_mapper import FieldTarget
+
+        package_dir = tmp_path / "pkg"
+        package_dir.mkdir()
+        (package_dir / "model.py").write_text("class Model(BaseModel):\n    id: str\n")
+        other = package_dir / "other.py"
+        other.write_text("class Other(BaseModel):\n    id: str\n")
+        target = FieldTarget(model_name="Model", field_name="id", alias_fqn="pkg.common_types.UUID", slot="self")
+
+        assert rewrite_all_modules(package_dir, {"Model.id": target}) == 1
+        assert "id: UUID" in (package_dir / "model.py").read_text()
+        assert other.read_text() == "class Other(BaseModel):\n    id: str\n"
+
+    def test_rewrite_all_modules_walks_subpackages(self, tmp_path):
+        from lithify.slas_field_mapper import FieldTarget
+
+        package_dir = tmp_path / "pkg"
+        (package_dir / "sub").mkdir(parents=True)
+        (package_dir / "defs").mkdir()
+        (package_dir / "sub" / "model.py").write_text("class Model(BaseModel):\n    id: str\n")
+        skipped = package_dir / "defs" / "model.py"
+        skipped.write_text("class Model(BaseModel):\n    id: str\n")
+        target = FieldTarget(model_name="Model", field_name="id", alias_fqn="pkg.common_types.UUID", slot="self")
+
+        assert rewrite_all_modules(package_dir, {"Model.id": target}) == 1
+        assert "from ..common_types import UUID" in (package_dir / "sub" / "model.py").read_text()
+        assert "id: str" in skipped.read_text()
+
+    def test_rewrite_all_modules_large_package(self, tmp_path):
+        from lithify.slas_field_mapper import FieldTarget
+
+        package_dir = tmp_path / "pkg"
+        package_dir.mkdir()
+        field_map = {}
+        for i in range(20):
+            (package_dir / f"model_{i}.py").write_text(f"class Model{i}(BaseModel):\n    id: str\n")
+            field_map[f"Model{i}.id"] = FieldTarget(f"Model{i}", "id", "pkg.common_types.UUID", "self")
+
+        assert rewrite_all_modules(package_dir, field_map) == 20
+        assert all("id: UUID" in f.read_text() for f in package_dir.glob("model_*.py"))
+
+    def test_cli_integration(self):
         from lithify.cli import app
         from lithify.slas_alias_generator import emit_alias_modules
         from lithify.slas_schema_index import SchemaIndex
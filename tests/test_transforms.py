@@ -9,7 +9,13 @@ import pytest
 
 from lithify.slas_field_mapper import FieldTarget
 from lithify.slas_rewriter import FieldRewriter
-from lithify.transforms import TypeHintTransformer, rewrite_type_hints_ast
+from lithify.transforms import (
+    _HINT_MARKERS_RE,
+    TypeHintTransformer,
+    _ensure_mapping_import,
+    apply_transforms,
+    rewrite_type_hints_ast,
+)
 
 
 @pytest.fixture
@@ -51,6 +57,121 @@ class TestModel:
         assert "from typing import" in result
         assert "Mapping" in result
 
+    def test_rewrite_type_hints_identical_sources_match(self, temp_dir):
+        code = "from typing import List\n\nclass M:\n    items: List[str]\n"
+        first = temp_dir / "a" / "model.py"
+        second = temp_dir / "b" / "model.py"
+        for path in (first, second):
+            path.parent.mkdir()
+            path.write_text(code)
+
+        rewrite_type_hints_ast(first.parent)
+        rewrite_type_hints_ast(second.parent)
+
+        assert "tuple[str, ...]" in first.read_text()
+        assert second.read_text() == first.read_text()
+
+    def test_apply_transforms_fuses_hints_and_docstrings(self, temp_dir):
+        long_doc = " ".join(["word"] * 40)
+        code = f'from typing import Dict\n\nclass M:\n    """{long_doc}"""\n    data: Dict[str, int]\n'
+        top = temp_dir / "model.py"
+        top.write_text(code)
+        nested = temp_dir / "sub" / "model.py"
+        nested.parent.mkdir()
+        nested.write_text(code)
+
+        changed = apply_transforms(temp_dir, hints=True, docstrings=True)
+
+        assert changed == 2
+        top_result = top.read_text()
+        assert "Mapping[str, int]" in top_result
+        assert "from typing import Mapping" in top_result
+        assert long_doc not in top_result  # re-wrapped onto several lines
+        nested_result = nested.read_text()
+        assert "Dict[str, int]" in nested_result  # hints only apply to top-level modules
+        assert long_doc not in nested_result
+
+    def test_apply_transforms_reports_each_pass(self, temp_dir, capsys):
+        long_doc = " ".join(["word"] * 40)
+        (temp_dir / "hinted.py").write_text("from typing import List\n\nclass H:\n    items: List[str]\n")
+        (temp_dir / "documented.py").write_text(f'class D:\n    """{long_doc}"""\n    name: str\n')
+
+        assert apply_transforms(temp_dir, hints=True, docstrings=True, verbose=1) == 2
+
+        out = capsys.readouterr().out
+        assert "[hints] rewrote type hints in 1 files" in out
+        assert "[docs] Re-wrapped docstrings in 1 files." in out
+
+    def test_apply_transforms_large_package(self, temp_dir):
+        for i in range(20):
+            (temp_dir / f"model_{i}.py").write_text(f"from typing import List\n\nclass M{i}:\n    items: List[str]\n")
+
+        assert apply_transforms(temp_dir, hints=True, docstrings=False) == 20
+        assert all("tuple[str, ...]" in f.read_text() for f in temp_dir.glob("model_*.py"))
+
+    def test_apply_transforms_leaves_untouched_files_verbatim(self, temp_dir):
+        code = '# generated by datamodel-codegen\nclass M:\n    """Short."""\n    items: tuple[str, ...]\n'
+        model = temp_dir / "model.py"
+        model.write_text(code)
+
+        assert apply_transforms(temp_dir, hints=True, docstrings=True) == 0
+        assert model.read_text() == code
+
+    def test_hint_rewrite_splices_original_text(self, temp_dir):
+        code = (
+            "# generated by datamodel-codegen\n"
+            "from typing import Dict, List, Optional\n\n"
+            "class M:\n"
+            "    items: Optional[List[str]] = None  # List[str] in a comment stays\n"
+            "    data: Dict[str, List[int]]\n"
+            "    note: str = 'List[int]'\n"
+        )
+        model = temp_dir / "spliced.py"
+        model.write_text(code)
+
+        rewrite_type_hints_ast(temp_dir)
+
+        assert model.read_text() == (
+            "# generated by datamodel-codegen\n"
+            "from typing import Mapping, Optional\n\n"
+            "class M:\n"
+            "    items: Optional[tuple[str, ...]] = None  # List[str] in a comment stays\n"
+            "    data: Mapping[str, tuple[int, ...]]\n"
+            "    note: str = 'List[int]'\n"
+        )
+
+    def test_hint_rewrite_falls_back_to_unparse(self, temp_dir):
+        # A parenthesised typing import cannot be spliced, so the module is unparsed as before
+        code = "from typing import (\n    Dict,\n)\n\nclass M:\n    data: Dict[str, int]  # dropped by unparse\n"
+        model = temp_dir / "unparsed.py"
+        model.write_text(code)
+
+        rewrite_type_hints_ast(temp_dir)
+
+        result = model.read_text()
+        assert result.startswith("from typing import Mapping\n")
+        assert "data: Mapping[str, int]" in result
+        assert "#" not in result
+
+    def test_hint_prefilter(self):
+        assert _HINT_MARKERS_RE.search(b"x: typing.List[int]")
+        assert _HINT_MARKERS_RE.search(b"x: Dict [str, int]")
+        assert _HINT_MARKERS_RE.search(b"x: MutableMapping[str, int]")
+        assert not _HINT_MARKERS_RE.search(b"x: Listing[int]\ny: tuple[int, ...]")
+
+    def test_ensure_mapping_import_splices_in_place(self):
+        src = "from __future__ import annotations\nfrom typing import Dict, Optional\nx: Mapping[str, int]"
+        assert _ensure_mapping_import(src) == (
+            "from __future__ import annotations\nfrom typing import Mapping, Optional\nx: Mapping[str, int]"
+        )
+
+        src = '"""doc"""\nfrom __future__ import annotations\nimport os\nx: Mapping[str, int]'
+        assert _ensure_mapping_import(src) == (
+            '"""doc"""\nfrom __future__ import annotations\nfrom typing import Mapping\nimport os\nx: Mapping[str, int]'
+        )
+
+        assert _ensure_mapping_import("x: Mapping[str, int]") == "from typing import Mapping\nx: Mapping[str, int]"
+
     def test_list_to_variadic_tuple(self):
         transformer = TypeHintTransformer()
 
@@ -1,13 +1,22 @@
 # tests/test_utils.py
 
 import json
+import math
 import time
 from pathlib import Path
 
 import pytest
 
 from lithify.frozendict import FrozenDict
-from lithify.utils import write_if_changed, write_manifest
+from lithify.utils import (
+    dump_json_file,
+    escape_pointer_token,
+    iter_files,
+    load_json_file,
+    map_parallel,
+    write_if_changed,
+    write_manifest,
+)
 
 
 class TestFrozenDict:
@@ -72,6 +81,74 @@ class TestUtils:
         assert changed is True
         assert path.read_text() == "New content"
 
+    def test_write_if_changed_same_size_different_content(self, temp_dir):
+        path = temp_dir / "existing.txt"
+        path.write_text("café\nline two\n")
+
+        assert write_if_changed(path, "cafe!\nline 2!!\n") is True
+        assert path.read_text() == "cafe!\nline 2!!\n"
+        assert write_if_changed(path, "cafe!\nline 2!!\n") is False
+
+    def test_dump_json_file_sorted_and_lossless(self, temp_dir):
+        path = temp_dir / "schema.json"
+        data = {"b": {"maximum": 2**70}, "a": "café"}
+
+        dump_json_file(path, data)
+
+        text = path.read_text(encoding="utf-8")
+        assert json.loads(text) == data
+        assert text.index('"a"') < text.index('"b"')
+        assert '\n  "a"' in text
+
+    def test_dump_json_file_keeps_non_finite_numbers(self, temp_dir):
+        path = temp_dir / "schema.json"
+        data = {"maximum": float("inf"), "minimum": float("-inf"), "const": float("nan"), "default": None}
+
+        dump_json_file(path, data)
+
+        text = path.read_text(encoding="utf-8")
+        assert '"maximum": Infinity' in text
+        assert '"minimum": -Infinity' in text
+        loaded = json.loads(text)
+        assert loaded["maximum"] == float("inf") and loaded["minimum"] == float("-inf")
+        assert math.isnan(loaded["const"])
+        assert loaded["default"] is None
+
+    def test_load_json_file_lossless_and_strict(self, temp_dir):
+        wide = temp_dir / "wide.json"
+        wide.write_text('{"maximum": 123456789012345678901234567890}', encoding="utf-8")
+        assert load_json_file(wide) == {"maximum": 123456789012345678901234567890}
+
+        path = temp_dir / "schema.json"
+        path.write_text(f'{{"maximum": {2**70}, "a": "café", "x": NaN}}', encoding="utf-8")
+
+        data = load_json_file(path)
+        assert data["maximum"] == 2**70
+        assert data["a"] == "café"
+        assert data["x"] != data["x"]
+
+        path.write_text("{not json", encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            load_json_file(path)
+
+    def test_escape_pointer_token(self):
+        assert escape_pointer_token("plain_name") == "plain_name"
+        assert escape_pointer_token("a/b") == "a~1b"
+        assert escape_pointer_token("~/") == "~0~1"
+        assert escape_pointer_token("~1") == "~01"
+
+    def test_iter_files(self, temp_dir):
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "dir.py").mkdir()
+        for rel in ("a.py", "skip.py", "notes.txt", "sub/b.py"):
+            (temp_dir / rel).write_text("")
+
+        top = {p.relative_to(temp_dir).as_posix() for p in iter_files(temp_dir, ".py", skip=frozenset({"skip.py"}))}
+        assert top == {"a.py"}
+
+        everything = {p.relative_to(temp_dir).as_posix() for p in iter_files(temp_dir, ".py", recursive=True)}
+        assert everything == {"a.py", "skip.py", "sub/b.py"}
+
     def test_write_manifest(self, temp_dir):
         write_manifest(
             temp_dir, mutability="deep-frozen", immutable_hints=True, use_frozendict=True, from_attributes=False
@@ -83,6 +160,47 @@ class TestUtils:
         manifest = json.loads(manifest_path.read_text())
         assert "mutability" in manifest or "generator" in manifest
 
+    def test_write_manifest_lists_classes(self, temp_dir):
+        (temp_dir / "models.py").write_text("class Café(BaseModel):\n    pass\n\nclass Order(Café):\n    pass\n")
+        (temp_dir / "constants.py").write_text("X = 1\n")
+        (temp_dir / "frozen_base.py").write_text("class FrozenModel(BaseModel):\n    pass\n")
+
+        write_manifest(
+            temp_dir, mutability="frozen", immutable_hints=False, use_frozendict=False, from_attributes=False
+        )
+
+        manifest = json.loads((temp_dir / "manifest.json").read_text())
+        assert manifest["files"] == {"models.py": ["Café", "Order"]}
+
+    @pytest.mark.parametrize("failure", ["no-processes", "broken-pool"])
+    def test_map_parallel_falls_back_to_serial(self, monkeypatch, failure):
+        from concurrent.futures.process import BrokenProcessPool
+
+        import lithify.utils as utils
+
+        class DyingPool:
+            def __init__(self, **kwargs):
+                if failure == "no-processes":
+                    raise OSError("no semaphores")
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def map(self, fn, tasks, chunksize=1):
+                raise BrokenProcessPool("worker died")
+
+        offsets = []
+        monkeypatch.setattr(utils.os, "cpu_count", lambda: 2)
+        monkeypatch.setattr(utils, "ProcessPoolExecutor", DyingPool)
+
+        results = map_parallel(lambda n: n + offsets[0], range(20), initializer=offsets.append, initargs=(100,))
+
+        assert results == list(range(100, 120))
+        assert offsets == [100]  # the initializer ran once, in this process
+
 
 @pytest.fixture
 def temp_dir():
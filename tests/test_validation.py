@@ -1,11 +1,18 @@
 # tests/test_validation.py
 
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
+import typer
 
-from lithify.validation import validate_deep_frozen_models, validate_frozen_models, validate_mutable_models
+from lithify.validation import (
+    _run_validators,
+    validate_deep_frozen_models,
+    validate_frozen_models,
+    validate_mutable_models,
+)
 
 
 @pytest.fixture
@@ -66,3 +73,34 @@ class FrozenModel(BaseModel):
             validate_deep_frozen_models(temp_dir, "FrozenModel")
         except (SystemExit, Exception):
             pass
+
+    @pytest.mark.parametrize("isolate", [False, True])
+    def test_run_validators_checks_mode(self, temp_dir, isolate):
+        package_dir = temp_dir / "pkg"
+        package_dir.mkdir()
+        (package_dir / "frozen_base.py").write_text(
+            "from pydantic import BaseModel, ConfigDict\n\n"
+            "class FrozenBase(BaseModel):\n    model_config = ConfigDict(frozen=True)\n"
+        )
+        (package_dir / "__init__.py").write_text("from .frozen_base import FrozenBase\n")
+
+        _run_validators("frozen", package_dir, "FrozenBase", isolate=isolate)
+        _run_validators("mutable", package_dir, "FrozenBase", isolate=isolate)
+
+        # A shallow base fails the deep-freeze probe
+        with pytest.raises(typer.Exit):
+            _run_validators("deep-frozen", package_dir, "FrozenBase", isolate=isolate)
+
+    def test_in_process_validation_restores_modules(self, temp_dir):
+        package_dir = temp_dir / "json"  # shadows an already imported stdlib module
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text(
+            "from pydantic import BaseModel\n\nclass Item(BaseModel):\n    name: str = 'x'\n"
+        )
+        stdlib_json = sys.modules["json"]
+        path_before = list(sys.path)
+
+        validate_mutable_models(package_dir)
+
+        assert sys.modules["json"] is stdlib_json
+        assert sys.path == path_before
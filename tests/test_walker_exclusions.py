@@ -1,6 +1,6 @@
 # tests/test_walker_exclusions.py
 
-from lithify.utils import walk_schema_nodes
+from lithify.utils import iter_allof_nodes, walk_schema_nodes, walk_schema_nodes_with_parent
 
 
 def test_walker_ignores_unevaluated_properties():
@@ -161,3 +161,55 @@ def test_walker_exclusions_are_intentional():
     assert "unevaluatedProperties" in excluded_keywords
     assert "unevaluatedItems" in excluded_keywords
     assert "propertyNames" in excluded_keywords
+
+
+def test_walker_with_parent_descends_into_replacement():
+    schema = {
+        "properties": {
+            "a": {"allOf": [{"properties": {"stale": {"type": "string"}}}]},
+        }
+    }
+
+    paths = []
+    for node, ptr, parent, key in walk_schema_nodes_with_parent(schema):
+        paths.append(ptr)
+        if ptr == "#":
+            assert parent is None and key is None
+        elif ptr == "#/properties/a":
+            assert parent[key] is node
+            parent[key] = {"properties": {"fresh": {"type": "string"}}}
+
+    assert "#/properties/a/properties/fresh" in paths
+    assert not any("stale" in p for p in paths)
+
+
+def test_walker_handles_deep_nesting():
+    schema = {"type": "object"}
+    node = schema
+    for _ in range(5000):
+        node["properties"] = {"child": {"type": "object"}}
+        node = node["properties"]["child"]
+
+    paths = [ptr for _, ptr in walk_schema_nodes(schema)]
+
+    assert len(paths) == 5001
+    assert paths[1] == "#/properties/child"
+    assert paths[-1] == "#" + "/properties/child" * 5000
+
+
+def test_iter_allof_nodes_matches_full_walk():
+    schema = {
+        "allOf": [{"type": "object"}],
+        "properties": {"a/b": {"allOf": [{"type": "string"}, {"minLength": 1}]}},
+        "patternProperties": {"^x": {"items": {"allOf": [{"type": "integer"}]}}},
+        "if": {"not": {"allOf": []}},
+        "$defs": {"D": {"oneOf": [{"allOf": [{"type": "string"}]}]}},
+        "unevaluatedProperties": {"allOf": [{"type": "string"}]},
+    }
+
+    expected = [ptr for node, ptr in walk_schema_nodes(schema) if "allOf" in node]
+    found = [ptr for _, ptr in iter_allof_nodes(schema)]
+
+    assert found == expected
+    assert "#/properties/a~1b" in found
+    assert "#/unevaluatedProperties" not in found
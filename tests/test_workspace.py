@@ -0,0 +1,19 @@
+# tests/test_workspace.py
+
+from lithify.workspace import copy_selected
+
+
+def test_copy_selected_copies_overlapping_matches_once(tmp_path):
+    src = tmp_path / "src"
+    (src / "sub" / "deep").mkdir(parents=True)
+    (src / "a.py").write_text("a = 1\n")
+    (src / "sub" / "b.py").write_text("b = 2\n")
+    (src / "sub" / "deep" / "c.py").write_text("c = 3\n")
+    (src / "notes.txt").write_text("skip\n")
+    dst = tmp_path / "dst"
+
+    copied = copy_selected(src, dst, ["*.py", "**/*.py"])
+
+    assert copied == [dst / "a.py", dst / "sub" / "b.py", dst / "sub" / "deep" / "c.py"]
+    assert (dst / "sub" / "deep" / "c.py").read_text() == "c = 3\n"
+    assert not (dst / "notes.txt").exists()